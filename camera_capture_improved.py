@@ -1,38 +1,134 @@
+import asyncio
+import collections
 import cv2
+import io
+import numpy as np
+import os
+import random
+import sys
+import tarfile
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Tuple
 import threading
-import queue
 import logging
 
+logger = logging.getLogger(__name__)
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+except ImportError:  # Optional: libjpeg-turbo SIMD encoder
+    TurboJPEG = None
+
+
+JPEG_QUALITY = 95
+MJPG_FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+MAX_CONSECUTIVE_FAILURES = 5  # Failed continuous captures before the camera is reopened
+STALE_FRAME_DRAIN = 4  # Most queued frames discarded to reach a fresh one
+
+
+def _preferred_backend() -> int:
+    """Pick an explicit capture backend so buffer settings are honored"""
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "win32":
+        return cv2.CAP_DSHOW
+    return cv2.CAP_ANY
+
+
+def _write_uncached(path: str, data, flush: bool = False) -> None:
+    """
+    Write a file and tell the kernel not to keep it in the page cache
+    
+    Captures are written once and rarely re-read, so caching them only
+    evicts hotter pages such as model weights during long runs.
+    
+    Args:
+        path: File to write
+        data: Bytes-like file contents
+        flush: Flush the data to disk first, so the advice also drops the
+            still-dirty pages (costs a synchronous disk write per call)
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if hasattr(os, "posix_fadvise"):
+            if flush and hasattr(os, "fdatasync"):
+                # DONTNEED skips dirty pages, so clean them before dropping the range
+                os.fdatasync(fd)
+            # Best effort otherwise: pages written back by then are dropped
+            os.posix_fadvise(fd, 0, len(data), os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class _Scratch:
+    """Buffers and constants reused by every capture on one camera"""
+    jpeg_params: List[int]
+    out_dir_prefix: str
+    encode_buf: bytearray = field(default_factory=bytearray)
+    # Held while encode_buf is being filled or read
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
 
 class CameraCapture:
     """Enhanced camera capture system with error handling and multi-camera support"""
     
-    def __init__(self, camera_index: int = 0, output_dir: str = "captures"):
+    def __init__(self, camera_index: int = 0, output_dir: str = "captures",
+                 capture_cpu: Optional[int] = None, flush_writes: bool = False):
         """
         Initialize camera capture system
         
         Args:
             camera_index: Camera device index
             output_dir: Directory to save captured images
+            capture_cpu: CPU to pin continuous-capture threads to (Linux only),
+                leaving the other cores to the detector
+            flush_writes: Flush each saved capture to disk so it can be
+                dropped from the page cache right away; off by default since
+                the flush blocks every save on the disk (slow on SD cards)
         """
         self.camera_index = camera_index
+        self.capture_cpu = capture_cpu
+        self.flush_writes = flush_writes
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
         self.cap = None
+        self._opened = False  # Mirrors cap.isOpened() without a native call per frame
         self.is_running = False
-        self.frame_queue = queue.Queue(maxsize=10)
+        # Latest capture paths; maxlen drops the oldest when consumers fall behind
+        self.frame_queue = collections.deque(maxlen=2)
+        self._frame_cv = threading.Condition()
+        self._stop_event = threading.Event()
+        self._cap_lock = threading.Lock()
+        
+        # Reused frame buffer so reads don't allocate a new HD image each time
+        self._frame_buf: Optional[np.ndarray] = None
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
+        # Live mode: a reader thread keeps the newest decoded frame in memory
+        self._live_thread: Optional[threading.Thread] = None
+        self._live_stop = threading.Event()
+        self._live_cv = threading.Condition()
+        self._live_frame: Optional[np.ndarray] = None
+        
+        # libjpeg-turbo encoder, created on first JPEG save if available
+        self._tjpeg = None
+        self._tjpeg_checked = False
+        
+        # Per-frame constants and encode buffer, built once for the hot capture paths
+        self._scratch = _Scratch(
+            jpeg_params=[cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY],
+            out_dir_prefix=str(self.output_dir) + os.sep
         )
-        self.logger = logging.getLogger(__name__)
+        
+        self.logger = logger
         
         # Camera settings
         self.resolution = (1920, 1080)  # Default HD resolution
@@ -46,17 +142,31 @@ class CameraCapture:
             True if successful, False otherwise
         """
         max_retries = 3
-        retry_delay = 2
+        base_delay = 0.1  # Transient USB/driver hiccups usually clear within ~100 ms
+        self._opened = False
+        
+        # Drop any previous handle so its driver buffers are freed before reopening
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
         
         for attempt in range(max_retries):
             try:
-                self.logger.info(f"Attempting to open camera {self.camera_index} (attempt {attempt + 1}/{max_retries})")
+                self.logger.info("Attempting to open camera %d (attempt %d/%d)",
+                                 self.camera_index, attempt + 1, max_retries)
                 
-                self.cap = cv2.VideoCapture(self.camera_index)
+                self.cap = cv2.VideoCapture(self.camera_index, _preferred_backend())
                 
                 if not self.cap.isOpened():
                     raise RuntimeError("Camera failed to open")
                 
+                # Keep only the newest frame in the driver queue so reads are not stale
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                
+                # Ask for MJPG before setting the size: it is cheaper to decode than
+                # YUYV and lets USB cameras deliver full HD at the requested rate
+                self.cap.set(cv2.CAP_PROP_FOURCC, MJPG_FOURCC)
+                
                 # Set camera properties
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
@@ -67,25 +177,107 @@ class CameraCapture:
                 if not ret or frame is None:
                     raise RuntimeError("Camera opened but cannot read frames")
                 
-                self.logger.info(f"Camera {self.camera_index} initialized successfully")
-                self.logger.info(f"Resolution: {frame.shape[1]}x{frame.shape[0]}")
+                if int(self.cap.get(cv2.CAP_PROP_FOURCC)) != MJPG_FOURCC:
+                    self.logger.info("Camera does not support MJPG, using its default pixel format")
                 
+                # The test frame has the negotiated resolution; reuse it as the read buffer
+                self._frame_buf = frame
+                
+                self.logger.info("Camera %d initialized successfully", self.camera_index)
+                self.logger.info("Resolution: %dx%d", frame.shape[1], frame.shape[0])
+                
+                self._opened = True
                 return True
                 
             except Exception as e:
-                self.logger.error(f"Camera initialization failed: {e}")
+                self.logger.error("Camera initialization failed: %s", e)
                 
                 if self.cap is not None:
                     self.cap.release()
                     self.cap = None
                 
                 if attempt < max_retries - 1:
-                    self.logger.info(f"Retrying in {retry_delay} seconds...")
+                    # Exponential backoff (0.1s, 0.3s, ...) with jitter so cameras
+                    # sharing a bus don't retry in lockstep
+                    retry_delay = base_delay * (3 ** attempt) + random.uniform(0, 0.05)
+                    self.logger.info("Retrying in %.2f seconds...", retry_delay)
                     time.sleep(retry_delay)
         
         self.logger.error("Failed to initialize camera after all retries")
         return False
     
+    def _require_open(self) -> bool:
+        """Check the camera was opened; captures never reopen it implicitly"""
+        if not self._opened:
+            self.logger.error("Camera not initialized; call initialize_camera() first")
+            return False
+        return True
+    
+    def capture_frame(self, copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Capture a frame into memory without encoding or saving it
+        
+        Args:
+            copy: Return a copy the caller owns. With False the pooled frame
+                buffer is returned, which the next capture overwrites. Ignored
+                in live mode, where the reader thread reuses buffers constantly.
+            
+        Returns:
+            BGR frame or None if failed
+        """
+        if not self._require_open():
+            return None
+        
+        if self._live_thread is not None:
+            return self.read_latest()
+        
+        try:
+            with self._cap_lock:
+                frame = self._read_frame()
+                if frame is None:
+                    return None
+                return frame.copy() if copy else frame
+                
+        except Exception as e:
+            self.logger.error("Error during capture: %s", e)
+            return None
+    
+    def capture_frame_and_persist(self, filename: Optional[str] = None,
+                                  copy: bool = True) -> Tuple[Optional[np.ndarray], Optional[str]]:
+        """
+        Capture a frame, save it to disk and also return it in memory
+        
+        Args:
+            filename: Custom filename (optional)
+            copy: Return a copy the caller owns (see capture_frame)
+            
+        Returns:
+            Tuple of (BGR frame, path to saved image); either may be None
+        """
+        if not self._require_open():
+            return None, None
+        
+        filename = self._resolve_filename(filename)
+        path_str = self._scratch.out_dir_prefix + filename
+        
+        if self._live_thread is not None:
+            frame = self.read_latest()
+            if frame is None:
+                return None, None
+            return frame, self._write_frame(frame, path_str, os.path.splitext(filename)[1])
+        
+        try:
+            with self._cap_lock:
+                frame = self._read_frame()
+                if frame is None:
+                    return None, None
+                image_path = self._write_frame(frame, path_str, os.path.splitext(filename)[1])
+                return (frame.copy() if copy else frame), image_path
+                
+        except Exception as e:
+            self.logger.error("Error during capture: %s", e)
+            return None, None
+    
     def capture_single_image(self, filename: Optional[str] = None) -> Optional[str]:
         """
         Capture a single image from the camera
@@ -96,71 +288,360 @@ class CameraCapture:
         Returns:
             Path to saved image or None if failed
         """
-        if self.cap is None or not self.cap.isOpened():
-            if not self.initialize_camera():
-                return None
+        if not self._require_open():
+            return None
+        
+        filename = self._resolve_filename(filename)
+        return self._capture_fast(self._scratch.out_dir_prefix + filename, os.path.splitext(filename)[1])
+    
+    def _capture_fast(self, path_str: str, suffix: str = '.jpg') -> Optional[str]:
+        """
+        Capture straight to a prebuilt output path
+        
+        Skips filename generation, extension checks and the open-camera
+        guard; callers must have initialized the camera.
         
+        Args:
+            path_str: Full output path
+            suffix: File extension of path_str including the dot
+            
+        Returns:
+            Path to saved image or None if failed
+        """
         try:
-            # Read frame
-            ret, frame = self.cap.read()
+            # Hold the lock until the pooled frame buffer has been saved
+            with self._cap_lock:
+                frame = self._read_frame()
+                if frame is None:
+                    return None
+                
+                return self._write_frame(frame, path_str, suffix)
+                
+        except Exception as e:
+            self.logger.error("Error during capture: %s", e)
+            return None
+    
+    def _read_frame(self) -> Optional[np.ndarray]:
+        """
+        Read the next frame into the pooled buffer (caller holds _cap_lock)
+        
+        Returns:
+            The frame buffer or None if the read failed
+        """
+        if not self._grab_fresh():
+            self.logger.error("Failed to grab frame from camera")
+            return None
+        
+        ret, frame = self.cap.retrieve(self._frame_buf)
+        
+        if not ret or frame is None:
+            self.logger.error("Failed to read frame from camera")
+            return None
+        
+        # OpenCV reallocates if the resolution changed; keep the new buffer
+        self._frame_buf = frame
+        return frame
+    
+    def _grab_fresh(self) -> bool:
+        """
+        Grab until the driver hands over a current frame (caller holds _cap_lock)
+        
+        Frames already queued by the driver come back almost instantly, while a
+        fresh one makes grab() wait for the sensor, so stop at the first grab
+        that had to wait. Nothing is decoded until the caller retrieves.
+        
+        Returns:
+            True if a frame was grabbed, False if the camera stopped delivering
+        """
+        fresh_wait = 0.5 / max(self.fps, 1)  # Half a frame period
+        for _ in range(STALE_FRAME_DRAIN):
+            start = time.perf_counter()
+            if not self.cap.grab():
+                return False
+            if time.perf_counter() - start >= fresh_wait:
+                break
+        return True
+    
+    def _capture_to_container(self, tar: tarfile.TarFile, filename: str) -> Optional[str]:
+        """
+        Capture a frame as a JPEG member of an open tar archive
+        
+        Args:
+            tar: Archive opened for appending
+            filename: Member name inside the archive
             
-            if not ret or frame is None:
-                self.logger.error("Failed to read frame from camera")
-                return None
+        Returns:
+            "<archive>::<member>" reference or None if failed
+        """
+        try:
+            with self._cap_lock, self._scratch.lock:
+                frame = self._read_frame()
+                if frame is None:
+                    return None
+                data = self._encode_frame(frame, '.jpg')
+                
+                if data is None:
+                    self.logger.error("Failed to encode image")
+                    return None
+                
+                info = tarfile.TarInfo(name=filename)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+            return f"{tar.name}::{filename}"
             
-            # Generate filename if not provided
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"capture_{timestamp}.jpg"
+        except Exception as e:
+            self.logger.error("Error during capture: %s", e)
+            return None
+    
+    def _resolve_filename(self, filename: Optional[str]) -> str:
+        """Generate a capture filename if needed and make sure it has an image extension"""
+        # Generate filename if not provided
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"capture_{timestamp}.jpg"
+        
+        # Ensure filename has extension
+        if not filename.endswith(('.jpg', '.jpeg', '.png')):
+            filename += '.jpg'
+        
+        return filename
+    
+    def _save_frame(self, frame, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Encode a frame and write it to the output directory
+        
+        Args:
+            frame: BGR image to save
+            filename: Custom filename (optional)
             
-            # Ensure filename has extension
-            if not filename.endswith(('.jpg', '.jpeg', '.png')):
-                filename += '.jpg'
+        Returns:
+            Path to saved image or None if failed
+        """
+        filename = self._resolve_filename(filename)
+        return self._write_frame(frame, self._scratch.out_dir_prefix + filename, os.path.splitext(filename)[1])
+    
+    def _write_frame(self, frame: np.ndarray, path_str: str, suffix: str) -> Optional[str]:
+        """Encode a frame and write it to path_str, returning the path or None"""
+        with self._scratch.lock:
+            data = self._encode_frame(frame, suffix)
+            if data is None:
+                self.logger.error("Failed to encode image")
+                return None
             
-            # Save image
-            output_path = self.output_dir / filename
+            try:
+                _write_uncached(path_str, data, self.flush_writes)
+            except OSError as e:
+                self.logger.error("Failed to save image: %s", e)
+                return None
+        
+        self.logger.info("Image saved: %s", path_str)
+        return path_str
+    
+    def _get_turbojpeg(self):
+        """Return the libjpeg-turbo encoder, or None if it is unavailable"""
+        if not self._tjpeg_checked:
+            self._tjpeg_checked = True
+            if TurboJPEG is not None:
+                try:
+                    self._tjpeg = TurboJPEG()
+                except (OSError, RuntimeError) as e:
+                    self.logger.warning("libjpeg-turbo unavailable, using OpenCV encoder: %s", e)
+        return self._tjpeg
+    
+    def _encode_frame(self, frame: np.ndarray, suffix: str) -> Optional[memoryview]:
+        """
+        Encode a frame for the given file extension
+        
+        JPEGs go through libjpeg-turbo when PyTurboJPEG is installed, encoding
+        in place into the scratch buffer; otherwise through OpenCV. The caller
+        must hold _scratch.lock until it is done with the returned view.
+        
+        Args:
+            frame: BGR image to encode
+            suffix: File extension including the dot
             
-            # Apply image quality settings
-            encode_params = [cv2.IMWRITE_JPEG_QUALITY, 95]
-            success = cv2.imwrite(str(output_path), frame, encode_params)
+        Returns:
+            View of the encoded image or None if encoding failed
+        """
+        if suffix in ('.jpg', '.jpeg'):
+            tjpeg = self._get_turbojpeg()
+            if tjpeg is not None:
+                if not hasattr(tjpeg, 'buffer_size'):
+                    # PyTurboJPEG < 1.7 cannot encode into a caller buffer
+                    return memoryview(tjpeg.encode(frame, quality=JPEG_QUALITY,
+                                                   pixel_format=TJPF_BGR))
+                scratch = self._scratch
+                needed = tjpeg.buffer_size(frame)
+                if len(scratch.encode_buf) < needed:
+                    scratch.encode_buf = bytearray(needed)
+                buf, size = tjpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR,
+                                         dst=scratch.encode_buf)
+                return memoryview(buf)[:size]
+            encode_params = self._scratch.jpeg_params
+        else:
+            encode_params = []
+        
+        # imencode has no output-buffer overload; expose its result without copying
+        success, encoded = cv2.imencode(suffix, frame, encode_params)
+        return memoryview(encoded.reshape(-1)) if success else None
+    
+    def capture_burst(self, count: int = 5, interval: float = 0.5,
+                      container: Optional[str] = None) -> List[str]:
+        """
+        Capture multiple images in quick succession
+        
+        Args:
+            count: Number of images to capture
+            interval: Time between captures in seconds
+            container: Tar archive to append the frames to instead of writing
+                one file each; relative paths are placed in output_dir
             
-            if success:
-                self.logger.info(f"Image saved: {output_path}")
-                return str(output_path)
-            else:
-                self.logger.error("Failed to save image")
-                return None
+        Returns:
+            List of paths to saved images ("<archive>::<member>" with a container)
+        """
+        if not self._require_open():
+            return []
+        
+        # One slot per frame; failed captures leave None and are filtered out
+        captured_images: List[Optional[str]] = [None] * count
+        
+        out_prefix = self._scratch.out_dir_prefix
+        tar = None
+        if container is not None:
+            container_path = Path(container)
+            if not container_path.is_absolute():
+                container_path = self.output_dir / container_path
+            tar = tarfile.open(container_path, "a")
+        
+        # Format the wall-clock part once; a monotonic offset keeps names unique
+        prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
+        start_ns = time.monotonic_ns()
+        
+        # Captures are scheduled from a fixed start so capture time doesn't add drift
+        deadline = time.monotonic()
+        
+        try:
+            for i in range(count):
+                filename = f"burst_{prefix}_{i:03d}_{time.monotonic_ns() - start_ns}.jpg"
                 
-        except Exception as e:
-            self.logger.error(f"Error during capture: {e}")
-            return None
+                if tar is None:
+                    captured_images[i] = self._capture_fast(out_prefix + filename)
+                else:
+                    captured_images[i] = self._capture_to_container(tar, filename)
+                
+                if i < count - 1:  # Don't sleep after last capture
+                    deadline += interval
+                    time.sleep(max(0.0, deadline - time.monotonic()))
+        finally:
+            if tar is not None:
+                tar.close()
+        
+        saved = [path for path in captured_images if path]
+        self.logger.info("Burst capture complete: %d/%d images saved", len(saved), count)
+        return saved
     
-    def capture_burst(self, count: int = 5, interval: float = 0.5) -> List[str]:
+    async def capture_single_image_async(self, filename: Optional[str] = None) -> Optional[str]:
         """
-        Capture multiple images in quick succession
+        Capture a single image without blocking the event loop
+        
+        The blocking read, encode and write run in the loop's default executor
+        so other cameras or network I/O can be serviced meanwhile.
+        
+        Args:
+            filename: Custom filename (optional)
+            
+        Returns:
+            Path to saved image or None if failed
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.capture_single_image, filename)
+    
+    async def capture_burst_async(self, count: int = 5, interval: float = 0.5,
+                                  container: Optional[str] = None) -> List[str]:
+        """
+        Capture a burst of images without blocking the event loop
         
         Args:
             count: Number of images to capture
             interval: Time between captures in seconds
+            container: Tar archive to append the frames to (optional)
             
         Returns:
             List of paths to saved images
         """
-        captured_images = []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.capture_burst, count, interval, container)
+    
+    def start_live(self):
+        """
+        Start live mode: a background thread reads frames at camera rate and
+        keeps the newest one, so capture_frame() returns without waiting on
+        the camera
+        """
+        if self._live_thread is not None:
+            return
+        
+        if not self._require_open():
+            return
+        
+        self._live_stop.clear()
+        with self._live_cv:
+            self._live_frame = None
+        self._live_thread = threading.Thread(target=self._live_loop, daemon=True)
+        self._live_thread.start()
+    
+    def _live_loop(self):
+        """Reader thread body for live mode"""
+        self._pin_current_thread()
+        back_buf = None  # Decoded into while consumers read the front frame
         
-        for i in range(count):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"burst_{timestamp}_{i:03d}.jpg"
+        while not self._live_stop.is_set():
+            with self._cap_lock:
+                if self.cap is not None:
+                    ret, frame = self.cap.read(back_buf)
+                else:
+                    ret, frame = False, None
             
-            image_path = self.capture_single_image(filename)
-            if image_path:
-                captured_images.append(image_path)
+            if not ret or frame is None:
+                self._live_stop.wait(0.05)
+                continue
+            
+            with self._live_cv:
+                back_buf, self._live_frame = self._live_frame, frame
+                self._live_cv.notify_all()
+    
+    def read_latest(self, copy: bool = True, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Get the newest frame held by the live-mode reader thread
+        
+        Args:
+            copy: Return a copy the caller owns. With False the live buffer
+                itself is returned; it is overwritten two frames later.
+            timeout: Maximum time to wait for the first frame in seconds
             
-            if i < count - 1:  # Don't sleep after last capture
-                time.sleep(interval)
+        Returns:
+            BGR frame or None if live mode is off or no frame arrived in time
+        """
+        if self._live_thread is None:
+            return None
         
-        self.logger.info(f"Burst capture complete: {len(captured_images)}/{count} images saved")
-        return captured_images
+        with self._live_cv:
+            if not self._live_cv.wait_for(lambda: self._live_frame is not None, timeout=timeout):
+                return None
+            frame = self._live_frame
+            return frame.copy() if copy else frame
+    
+    def stop_live(self):
+        """Stop the live-mode reader thread"""
+        if self._live_thread is None:
+            return
+        
+        self._live_stop.set()
+        self._live_thread.join(timeout=5)
+        self._live_thread = None
+        with self._live_cv:
+            self._live_frame = None
     
     def start_continuous_capture(self, interval: float = 5.0):
         """
@@ -173,44 +654,107 @@ class CameraCapture:
             self.logger.warning("Continuous capture already running")
             return
         
+        if not self._require_open():
+            return
+        
         self.is_running = True
+        self._stop_event.clear()
+        
+        def grab_loop():
+            self._pin_current_thread()
+            
+            # Keep draining the driver at camera rate; only the worker decodes
+            while not self._stop_event.is_set():
+                with self._cap_lock:
+                    grabbed = self.cap is not None and self.cap.grab()
+                if not grabbed:
+                    self._stop_event.wait(0.05)
         
         def capture_loop():
             self.logger.info("Starting continuous capture...")
+            self._pin_current_thread()
+            frame_buf = None  # Worker-owned buffer, reused across captures
+            deadline = time.monotonic()
+            consecutive_failures = 0
             
-            while self.is_running:
+            while not self._stop_event.is_set():
                 try:
-                    image_path = self.capture_single_image()
+                    # Only the frame we keep gets decoded
+                    with self._cap_lock:
+                        if self.cap is not None and self.cap.grab():
+                            ret, frame = self.cap.retrieve(frame_buf)
+                            frame_buf = frame if ret else frame_buf
+                        else:
+                            ret, frame = False, None
+                    
+                    image_path = self._save_frame(frame) if ret and frame is not None else None
                     
                     if image_path:
-                        self.frame_queue.put(image_path)
+                        consecutive_failures = 0
+                        self._enqueue_latest(image_path)
                     else:
-                        self.logger.warning("Failed to capture image, attempting to reinitialize camera")
-                        if not self.initialize_camera():
+                        consecutive_failures += 1
+                        self.logger.warning("Failed to capture image (%d consecutive)", consecutive_failures)
+                    
+                    # Reuse the open handle; only reopen after a sustained failure run
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                        self.logger.error("%d consecutive capture failures, reinitializing camera",
+                                          consecutive_failures)
+                        with self._cap_lock:
+                            reinitialized = self.initialize_camera()
+                        if reinitialized:
+                            consecutive_failures = 0
+                        else:
                             self.logger.error("Camera reinitialization failed")
-                            time.sleep(5)  # Wait before retry
+                            self._stop_event.wait(5)  # Wait before retry
                     
-                    # Wait for next capture
-                    time.sleep(interval)
+                    # Wait for next capture, measured from the start of this one;
+                    # after an overrun, restart the schedule instead of catching up
+                    deadline = max(deadline + interval, time.monotonic())
+                    self._stop_event.wait(deadline - time.monotonic())
                     
                 except Exception as e:
-                    self.logger.error(f"Error in continuous capture: {e}")
-                    time.sleep(1)
+                    self.logger.error("Error in continuous capture: %s", e)
+                    self._stop_event.wait(1)
             
             self.logger.info("Continuous capture stopped")
         
-        # Start capture thread
+        # Start grab and capture threads
+        self.grab_thread = threading.Thread(target=grab_loop, daemon=True)
+        self.grab_thread.start()
         self.capture_thread = threading.Thread(target=capture_loop, daemon=True)
         self.capture_thread.start()
     
+    def _pin_current_thread(self):
+        """Pin the calling thread to capture_cpu so encoding stays off detector cores"""
+        if self.capture_cpu is None:
+            return
+        if not hasattr(os, "sched_setaffinity"):
+            self.logger.warning("CPU pinning not supported on this platform")
+            return
+        try:
+            # On Linux, pid 0 targets only the calling thread
+            os.sched_setaffinity(0, {self.capture_cpu})
+        except OSError as e:
+            self.logger.warning("Could not pin capture thread to CPU %d: %s", self.capture_cpu, e)
+    
+    def _enqueue_latest(self, image_path: str):
+        """Queue a capture, dropping the oldest entry if consumers fall behind"""
+        with self._frame_cv:
+            self.frame_queue.append(image_path)
+            self._frame_cv.notify()
+    
     def stop_continuous_capture(self):
         """Stop continuous capture"""
         if self.is_running:
             self.logger.info("Stopping continuous capture...")
             self.is_running = False
+            self._stop_event.set()
             
             if hasattr(self, 'capture_thread'):
                 self.capture_thread.join(timeout=5)
+            if hasattr(self, 'grab_thread'):
+                self.grab_thread.join(timeout=5)
     
     def get_latest_capture(self, timeout: float = 1.0) -> Optional[str]:
         """
@@ -222,10 +766,10 @@ class CameraCapture:
         Returns:
             Path to latest image or None
         """
-        try:
-            return self.frame_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+        with self._frame_cv:
+            if not self._frame_cv.wait_for(lambda: self.frame_queue, timeout=timeout):
+                return None
+            return self.frame_queue.popleft()
     
     def get_camera_info(self) -> dict:
         """
@@ -249,10 +793,12 @@ class CameraCapture:
     def release(self):
         """Release camera resources"""
         self.stop_continuous_capture()
+        self.stop_live()
         
         if self.cap is not None:
             self.cap.release()
             self.cap = None
+            self._opened = False
             self.logger.info("Camera released")
     
     def __enter__(self):
@@ -267,7 +813,10 @@ class CameraCapture:
 
 def main():
     """Main function for testing camera capture"""
-    import sys
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     
     # Parse command line arguments
     camera_index = int(sys.argv[1]) if len(sys.argv) > 1 else 0
@@ -6,6 +6,9 @@ Verifies all components work correctly
 
 import sys
 import os
+import functools
+import contextlib
+import tempfile
 from pathlib import Path
 import numpy as np
 import cv2
@@ -55,6 +58,28 @@ class TestRunner:
 # Create test runner
 runner = TestRunner()
 
+# Blank frame shared by detection tests
+BLANK_IMAGE = np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+@contextlib.contextmanager
+def _in_temp_dir():
+    """Run the block in a scratch working directory, so data files don't touch the real ones"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            yield Path(tmp)
+        finally:
+            os.chdir(cwd)
+
+
+@functools.lru_cache(maxsize=1)
+def _detector():
+    """Load the YOLO detector once and share it across tests"""
+    from vehicle_detection_improved import VehicleDetector
+    return VehicleDetector()
+
 
 @runner.test("Python version check")
 def test_python_version():
@@ -89,9 +114,7 @@ def test_yolo_files():
 @runner.test("Vehicle detector initialization")
 def test_vehicle_detector():
     """Test vehicle detector can be initialized"""
-    from vehicle_detection_improved import VehicleDetector
-    
-    detector = VehicleDetector()
+    detector = _detector()
     assert detector.net is not None, "YOLO network not loaded"
     assert len(detector.classes) > 0, "Class names not loaded"
 
@@ -99,13 +122,8 @@ def test_vehicle_detector():
 @runner.test("Vehicle detection on test image")
 def test_detection():
     """Test vehicle detection with a synthetic image"""
-    from vehicle_detection_improved import VehicleDetector
-    
-    # Create a test image (blank image)
-    test_image = np.zeros((480, 640, 3), dtype=np.uint8)
-    
-    detector = VehicleDetector()
-    vehicles = detector.detect_vehicles(test_image)
+    detector = _detector()
+    vehicles = detector.detect_vehicles(BLANK_IMAGE)
     
     # Should return empty list for blank image
     assert isinstance(vehicles, list), "Detection should return a list"
@@ -254,6 +272,319 @@ def test_integration_module():
     assert system.data_dir.exists(), "Data directory not created"
 
 
+@runner.test("Signal history JSONL round-trip")
+def test_history_round_trip():
+    """Test timings appended as JSON Lines load back unchanged"""
+    from traffic_signal_improved import TrafficSignalController
+    
+    with _in_temp_dir():
+        controller = TrafficSignalController()
+        for count in [3, 8, 15]:
+            controller.calculate_signal_timing(vehicle_count=count, algorithm="linear")
+        
+        reloaded = TrafficSignalController()
+        assert reloaded.history == controller.history, "History not preserved"
+
+
+@runner.test("Legacy JSON array migration")
+def test_legacy_migration():
+    """Test JSON array files from older versions are converted to JSON Lines"""
+    import json
+    from traffic_signal_improved import TrafficSignalController
+    from traffic_management_system import TrafficManagementSystem
+    
+    with _in_temp_dir() as tmp:
+        timing = {"green_time": 35, "yellow_time": 3, "all_red_time": 2,
+                  "total_cycle_time": 40, "vehicle_count": 5,
+                  "weighted_vehicle_count": 5.0,
+                  "timestamp": "2024-01-01T12:00:00", "algorithm": "linear"}
+        Path("signal_timing_history.json").write_text(json.dumps([timing]))
+        
+        controller = TrafficSignalController()
+        assert Path("signal_timing_history.jsonl").exists(), "History not migrated"
+        assert len(controller.history) == 1, "Migrated history not loaded"
+        assert isinstance(controller.history[0].timestamp, float), \
+            "ISO timestamp not converted"
+        
+        cycles = [{"timestamp": "2024-01-01T12:00:00", "vehicle_count": n,
+                   "vehicle_stats": {"car": n, "total": n}, "green_time": 30 + n,
+                   "algorithm": "linear", "processing_time": 1.0} for n in range(3)]
+        (tmp / "traffic_data").mkdir()
+        (tmp / "traffic_data" / "cycle_data.json").write_text(json.dumps(cycles))
+        
+        system = TrafficManagementSystem(camera_index=0)
+        system._io_pool.shutdown()
+        assert system.cycle_data_file.exists(), "Cycle data not migrated"
+        assert system.cycle_data == cycles, "Migrated cycle data not loaded"
+
+
+@runner.test("Truncated last line is skipped")
+def test_truncated_line():
+    """Test a partial record left by an interrupted append doesn't discard the file"""
+    import json
+    from traffic_signal_improved import TrafficSignalController
+    from visualize_data import load_cycle_data
+    
+    with _in_temp_dir() as tmp:
+        controller = TrafficSignalController()
+        controller.calculate_signal_timing(vehicle_count=4)
+        with open("signal_timing_history.jsonl", "a") as f:
+            f.write('{"green_time": 3')
+        assert len(TrafficSignalController().history) == 1, "Valid history record lost"
+        
+        cycle_file = tmp / "cycle_data.jsonl"
+        cycle_file.write_text(json.dumps({"vehicle_count": 2, "green_time": 30}) + "\n"
+                              + '{"vehicle_count": 5, "gre')
+        records = load_cycle_data(cycle_file)
+        assert records == [{"vehicle_count": 2, "green_time": 30}], \
+            "Valid cycle record lost"
+
+
+@runner.test("Incremental report aggregates")
+def test_report_aggregates():
+    """Test loaded and per-cycle running totals match a full scan of the records"""
+    import random
+    from traffic_management_system import TrafficManagementSystem
+    
+    def full_scan_report(cycles):
+        n = len(cycles)
+        vehicle_types = {}
+        for cycle in cycles:
+            for v_type, count in cycle['vehicle_stats'].items():
+                if v_type != 'total':
+                    vehicle_types[v_type] = vehicle_types.get(v_type, 0) + count
+        return (
+            sum(c['vehicle_count'] for c in cycles),
+            round(sum(c['vehicle_count'] for c in cycles) / n, 2),
+            vehicle_types,
+            round(sum(c['green_time'] for c in cycles) / n, 2),
+            min(c['green_time'] for c in cycles),
+            max(c['green_time'] for c in cycles),
+            round(sum(c['processing_time'] for c in cycles) / n, 2),
+            round(sum(c['green_time'] - 30 for c in cycles if c['green_time'] > 30), 2)
+        )
+    
+    def summary(report):
+        traffic = report['traffic_statistics']
+        timing = report['timing_statistics']
+        return (
+            traffic['total_vehicles_detected'],
+            traffic['average_vehicles_per_cycle'],
+            traffic['vehicle_type_breakdown'],
+            timing['average_green_time'],
+            timing['min_green_time'],
+            timing['max_green_time'],
+            report['performance']['average_processing_time'],
+            report['performance']['total_time_saved']
+        )
+    
+    rng = random.Random(0)
+    cycles = []
+    for _ in range(40):
+        stats = {'car': rng.randint(0, 20), 'bus': rng.randint(0, 3), 'truck': rng.randint(0, 4)}
+        stats['total'] = sum(stats.values())
+        cycles.append({"timestamp": "2024-01-01T12:00:00", "vehicle_count": stats['total'],
+                       "vehicle_stats": stats, "green_time": rng.randint(15, 120),
+                       "processing_time": round(rng.uniform(0.5, 3.0), 2)})
+    
+    with _in_temp_dir():
+        system = TrafficManagementSystem(camera_index=0)
+        system._io_pool.shutdown()
+        assert system.generate_report() == {"message": "No data available"}, \
+            "Empty report incorrect"
+        
+        for cycle in cycles[:25]:
+            system._update_aggregates(cycle)
+        assert summary(system.generate_report()) == full_scan_report(cycles[:25]), \
+            "Per-cycle aggregates differ from a full scan"
+        
+        system._rebuild_aggregates(cycles)
+        assert summary(system.generate_report()) == full_scan_report(cycles), \
+            "Rebuilt aggregates differ from a full scan"
+
+
+@runner.test("Adaptive timing ring buffer")
+def test_adaptive_ring_buffer():
+    """Test adaptive timing matches a mean over the last 20 history entries"""
+    import random
+    import statistics
+    from traffic_signal_improved import TrafficSignalController
+    
+    def reference(controller, count):
+        base_time = controller.linear_algorithm(count)
+        if len(controller.history) >= 10:
+            avg = statistics.mean(h.weighted_vehicle_count for h in controller.history[-20:])
+            if count > avg * 1.5:
+                base_time = int(base_time * 1.2)
+            elif count < avg * 0.5:
+                base_time = int(base_time * 0.8)
+        return max(controller.config.min_green_time,
+                   min(controller.config.max_green_time, base_time))
+    
+    rng = random.Random(0)
+    with _in_temp_dir():
+        controller = TrafficSignalController()
+        for _ in range(60):
+            count = rng.choice([0, 2, 5, 9, 14, 25, 40])
+            expected = reference(controller, count)
+            assert controller.adaptive_algorithm(count) == expected, \
+                f"Adaptive timing differs with {len(controller.history)} cycles of history"
+            controller.calculate_signal_timing(vehicle_count=count)
+        
+        # Ring buffers are refilled from the tail of the loaded history
+        reloaded = TrafficSignalController()
+        for count in [0, 5, 40]:
+            assert reloaded.adaptive_algorithm(count) == reference(reloaded, count), \
+                "Adaptive timing differs after reloading history"
+
+
+@runner.test("Timing cache eviction")
+def test_timing_cache():
+    """Test the timing cache keeps only the newest TIMING_CACHE_SIZE results"""
+    from traffic_signal_improved import TrafficSignalController, TIMING_CACHE_SIZE
+    
+    controller = TrafficSignalController()
+    counts = [float(n) for n in range(TIMING_CACHE_SIZE + 5)]
+    for count in counts:
+        controller.linear_algorithm(count)
+    
+    cache = controller._timing_cache
+    assert len(cache) == TIMING_CACHE_SIZE, "Cache grew past TIMING_CACHE_SIZE"
+    assert ('linear', counts[0]) not in cache, "Oldest entry not evicted"
+    assert list(cache) == [('linear', c) for c in counts[-TIMING_CACHE_SIZE:]], \
+        "Cache did not evict oldest first"
+    
+    controller.linear_algorithm(counts[0])
+    assert next(reversed(cache)) == ('linear', counts[0]), "Evicted entry not re-added"
+    assert ('linear', counts[-TIMING_CACHE_SIZE]) not in cache, "Re-adding did not evict"
+
+
+@runner.test("DetectionResult list conversion")
+def test_detection_result():
+    """Test DetectionResult converts to the list form and counts vehicles the same way"""
+    from vehicle_detection_improved import DetectionResult, VehicleDetector
+    
+    rng = np.random.default_rng(0)
+    n = 12
+    result = DetectionResult(
+        bboxes=rng.integers(0, 400, size=(n, 4)).astype(np.int32),
+        confidences=rng.uniform(0.5, 1.0, size=n).astype(np.float32),
+        class_ids=rng.choice(list(VehicleDetector.VEHICLE_CLASSES), size=n).astype(np.uint8)
+    )
+    
+    vehicles = result.to_list()
+    assert len(vehicles) == len(result), "Conversion changed the number of detections"
+    for i, vehicle in enumerate(vehicles):
+        x, y, w, h = (int(v) for v in result.bboxes[i])
+        assert vehicle.bbox == (x, y, w, h), "Bounding box differs"
+        assert vehicle.center == (x + w // 2, y + h // 2), "Center differs"
+        assert vehicle.confidence == float(result.confidences[i]), "Confidence differs"
+        assert vehicle.class_name == VehicleDetector.VEHICLE_CLASSES[int(result.class_ids[i])], \
+            "Class name differs"
+    
+    # Statistics only read VEHICLE_CLASSES, so no model needs to be loaded
+    detector = object.__new__(VehicleDetector)
+    assert detector.get_vehicle_statistics(result) == detector.get_vehicle_statistics(vehicles), \
+        "Statistics differ between DetectionResult and list"
+    
+    empty = DetectionResult(np.empty((0, 4), np.int32), np.empty(0, np.float32),
+                            np.empty(0, np.uint8))
+    assert empty.to_list() == [], "Empty result should convert to an empty list"
+    assert detector.get_vehicle_statistics(empty) == detector.get_vehicle_statistics([]), \
+        "Statistics differ for no detections"
+
+
+@runner.test("Compiled detection row filter")
+def test_filter_rows():
+    """Test the Numba row filter keeps the same rows as the NumPy fallback"""
+    from vehicle_detection_improved import (VehicleDetector, _filter_rows,
+                                            _filter_rows_numpy)
+    if _filter_rows is None:
+        return  # Numba not installed; only the NumPy path is used
+    
+    rng = np.random.default_rng(0)
+    rows = rng.random((2000, 85), dtype=np.float32)
+    rows[:, 5:] **= 8  # Mostly low scores, so the threshold matters
+    rows[::50, 5:] = 0.75  # Ties: the first class must win, like argmax
+    vehicle_classes = np.array(list(VehicleDetector.VEHICLE_CLASSES))
+    vehicle_mask = np.zeros(80, dtype=np.bool_)
+    vehicle_mask[vehicle_classes] = True
+    
+    for threshold in [0.0, 0.5, 0.9]:
+        compiled = _filter_rows(rows, np.float32(threshold), vehicle_mask)
+        fallback = _filter_rows_numpy(rows, threshold, vehicle_classes)
+        for got, expected, name in zip(compiled, fallback, ["rows", "class ids", "confidences"]):
+            assert np.array_equal(got, expected), \
+                f"Kept {name} differ at threshold {threshold}"
+
+
+@runner.test("Green time histogram bins")
+def test_green_time_bins():
+    """Test searchsorted binning matches the inclusive 30/45/60/90 bin edges"""
+    from visualize_data import green_time_histogram
+    
+    def bin_label(time):
+        if time <= 30:
+            return "15-30s"
+        elif time <= 45:
+            return "31-45s"
+        elif time <= 60:
+            return "46-60s"
+        elif time <= 90:
+            return "61-90s"
+        return "91-120s"
+    
+    # Every edge, its neighbours, and values outside the 15-120s range
+    green_times = [0, 15, 29, 30, 31, 44, 45, 46, 59, 60, 61, 89, 90, 91, 120, 150]
+    for time in green_times:
+        bins = green_time_histogram(np.array([time]))
+        assert bins[bin_label(time)] == 1 and sum(bins.values()) == 1, \
+            f"{time}s landed in the wrong bin"
+    
+    expected = dict.fromkeys(["15-30s", "31-45s", "46-60s", "61-90s", "91-120s"], 0)
+    for time in green_times:
+        expected[bin_label(time)] += 1
+    assert green_time_histogram(np.array(green_times)) == expected, "Bin counts differ"
+
+
+@runner.test("Batch detection in slices")
+def test_batch_slices():
+    """Test slices of a large batch keep their own outputs when the model reuses a buffer"""
+    from vehicle_detection_improved import VehicleDetector
+    
+    # Only the decode settings are needed; _forward is stubbed below
+    detector = object.__new__(VehicleDetector)
+    detector.confidence_threshold = 0.5
+    detector.nms_threshold = 0.4
+    detector._input_size = 32
+    detector._vehicle_mask = None
+    detector._vehicle_class_array = np.array(list(VehicleDetector.VEHICLE_CLASSES))
+    
+    # Like the TensorRT engine: every call writes into and returns views of one buffer
+    buffer = np.zeros((8, 1, 85), dtype=np.float32)
+    
+    def forward(blob):
+        out = buffer[:len(blob)]
+        out[:] = 0
+        out[:, 0, 0] = blob.mean(axis=(1, 2, 3))  # Box x center identifies the image
+        out[:, 0, 1:4] = [0.5, 0.2, 0.2]
+        out[:, 0, 5 + 2] = 0.9  # One confident car per image
+        return [out]
+    
+    detector._forward = forward
+    images = [np.full((100, 100, 3), 40 * (i + 1), dtype=np.uint8) for i in range(5)]
+    
+    detector._max_batch = None
+    expected = detector.detect_batch(images)
+    assert len({int(r.bboxes[0, 0]) for r in expected}) == len(images), \
+        "Stub outputs should differ per image"
+    
+    detector._max_batch = 2
+    for got, want in zip(detector.detect_batch(images), expected):
+        assert np.array_equal(got.bboxes, want.bboxes), \
+            "Earlier slices took another slice's detections"
+
+
 def main():
     """Run all tests"""
     success = runner.run_all()
@@ -6,38 +6,106 @@ Complete Integration Module
 
 import time
 import json
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 import logging
+import logging.handlers
 import argparse
+import queue
+import threading
+import cv2
+import numpy as np
 
 # Import improved modules
 from camera_capture_improved import CameraCapture
 from vehicle_detection_improved import VehicleDetector
-from traffic_signal_improved import TrafficSignalController
+from traffic_signal_improved import TrafficSignalController, _file_signature
+
+try:
+    import orjson
+except ImportError:  # Optional: Rust-backed JSON (de)serializer
+    orjson = None
+
+
+SEPARATOR = "=" * 60
+# Annotated result images only need to be legible, so trade quality for speed and size
+RESULT_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+SCENE_HASH_MAX_DISTANCE = 4  # Hash bits that may differ for a frame to count as unchanged
+SCENE_REUSE_MAX_CYCLES = 3  # Consecutive cycles that may reuse detections before a forced rerun
+FIXED_GREEN_TIME = 30  # Fixed-timer green time that "time saved" is measured against
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate traffic_system.log at 10 MB
+LOG_BACKUP_COUNT = 5  # Rotated log files kept alongside the current one
+
+
+def _scene_hash(image: np.ndarray) -> int:
+    """
+    64-bit average hash of a frame: downscale to 8x8 gray and set one bit
+    per pixel brighter than the mean
+    """
+    small = cv2.resize(image, (8, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return int.from_bytes(np.packbits(gray > gray.mean()).tobytes(), 'big')
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class TrafficManagementSystem:
     """Integrated traffic management system"""
     
-    def __init__(self, camera_index: int = 0, algorithm: str = "adaptive"):
+    def __init__(self, camera_index: int = 0, algorithm: str = "adaptive",
+                 always_detect: bool = False,
+                 engine_path: Optional[str] = None,
+                 onnx_path: Optional[str] = None):
         """
         Initialize the traffic management system
         
         Args:
             camera_index: Camera device index
             algorithm: Signal timing algorithm to use
+            always_detect: Run detection on every frame, even when the scene
+                looks unchanged since the previous cycle
+            engine_path: TensorRT engine to run detection with instead of
+                the OpenCV DNN model (optional)
+            onnx_path: YOLOv8 ONNX model to run detection with through ONNX
+                Runtime instead of the OpenCV DNN model (optional)
         """
         self.camera_index = camera_index
         self.algorithm = algorithm
+        self.always_detect = always_detect
+        self.engine_path = engine_path
+        self.onnx_path = onnx_path
+        
+        # Hash and detections of the last frame that went through the detector
+        self._last_hash: Optional[int] = None
+        self._last_vehicles = None
+        self._last_stats: Optional[Dict] = None
+        # Cycles in a row that reused those detections instead of running the detector
+        self._reuse_count = 0
         
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler('traffic_system.log'),
+                logging.handlers.RotatingFileHandler(
+                    'traffic_system.log', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+                ),
                 logging.StreamHandler()
             ]
         )
@@ -48,31 +116,149 @@ class TrafficManagementSystem:
         self.detector = None
         self.controller = None
         
+        # Single background writer for result images, cycle data and signal
+        # history, so disk I/O stays off the cycle path (one worker keeps order)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tms-io")
+        
         # Data storage
         self.data_dir = Path("traffic_data")
         self.data_dir.mkdir(exist_ok=True)
         
         self.cycle_data = []
-        self.cycle_data_file = self.data_dir / "cycle_data.json"
+        # One JSON record per line, so each cycle is a constant-time append
+        self.cycle_data_file = self.data_dir / "cycle_data.jsonl"
+        self.legacy_cycle_data_file = self.data_dir / "cycle_data.json"
+        
+        # (mtime_ns, size) of cycle_data_file as of the in-memory records
+        self._cycle_data_signature: Optional[Tuple[int, int]] = None
         
+        # Running totals so generate_report does not rescan every cycle
+        self._reset_aggregates()
         self._load_cycle_data()
     
     def _load_cycle_data(self):
         """Load historical cycle data"""
-        if self.cycle_data_file.exists():
+        if not self.cycle_data_file.exists() and self.legacy_cycle_data_file.exists():
+            self._migrate_legacy_cycle_data()
+        
+        signature = _file_signature(self.cycle_data_file)
+        if signature is not None and signature == self._cycle_data_signature:
+            return  # Unchanged since the last load or our own last append
+        
+        if signature is not None:
             try:
-                with open(self.cycle_data_file, 'r') as f:
-                    self.cycle_data = json.load(f)
+                records = []
+                with open(self.cycle_data_file, 'rb') as f:
+                    for line_no, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            records.append(_json_loads(line))
+                        except ValueError:
+                            # A crash mid-append can leave a truncated last line
+                            self.logger.warning("Skipping malformed cycle record on line %d", line_no)
+                self.cycle_data = records
+                
+                self._rebuild_aggregates(records)
+                self._cycle_data_signature = signature
             except Exception as e:
-                self.logger.error(f"Could not load cycle data: {e}")
+                self.logger.error("Could not load cycle data: %s", e)
+    
+    def _migrate_legacy_cycle_data(self):
+        """Convert a cycle_data.json array from older versions to JSON Lines"""
+        try:
+            with open(self.legacy_cycle_data_file, 'rb') as f:
+                records = _json_loads(f.read())
+            
+            tmp_file = self.cycle_data_file.with_suffix('.jsonl.tmp')
+            with open(tmp_file, 'wb') as f:
+                for record in records:
+                    f.write(_json_dumps(record) + b"\n")
+            tmp_file.replace(self.cycle_data_file)
+            
+            self.logger.info("Migrated %d cycle records to %s", len(records), self.cycle_data_file)
+        except Exception as e:
+            self.logger.error("Could not migrate legacy cycle data: %s", e)
+    
+    def _reset_aggregates(self):
+        """Clear the running totals used by generate_report"""
+        self._agg = {
+            'n': 0,
+            'total_vehicles': 0,
+            'total_green': 0,
+            'total_processing': 0.0,
+            'min_green': math.inf,
+            'max_green': 0,
+            'time_saved': 0,
+            'vehicle_types': Counter()
+        }
+    
+    def _rebuild_aggregates(self, records: List[Dict]):
+        """Recompute the running totals for a full set of loaded records"""
+        self._reset_aggregates()
+        n = len(records)
+        if not n:
+            return
+        
+        # One array per column, so each reduction below runs in C
+        green = np.fromiter((r['green_time'] for r in records), dtype=np.int64, count=n)
+        vehicles = np.fromiter((r['vehicle_count'] for r in records), dtype=np.int64, count=n)
+        processing = np.fromiter((r.get('processing_time', 0.0) for r in records),
+                                 dtype=np.float64, count=n)
+        extra_green = green - FIXED_GREEN_TIME
+        
+        vehicle_types = Counter()
+        for record in records:
+            vehicle_types.update(record.get('vehicle_stats', {}))
+        vehicle_types.pop('total', None)
+        
+        self._agg.update(
+            n=n,
+            total_vehicles=int(vehicles.sum()),
+            total_green=int(green.sum()),
+            total_processing=float(processing.sum()),
+            min_green=int(green.min()),
+            max_green=int(green.max()),
+            time_saved=int(extra_green[extra_green > 0].sum()),
+            vehicle_types=vehicle_types
+        )
+    
+    def _update_aggregates(self, record: Dict):
+        """Fold a single cycle record into the running totals"""
+        agg = self._agg
+        green_time = record['green_time']
+        
+        agg['n'] += 1
+        agg['total_vehicles'] += record['vehicle_count']
+        agg['total_green'] += green_time
+        agg['total_processing'] += record.get('processing_time', 0.0)
+        agg['min_green'] = min(agg['min_green'], green_time)
+        agg['max_green'] = max(agg['max_green'], green_time)
+        if green_time > FIXED_GREEN_TIME:
+            agg['time_saved'] += green_time - FIXED_GREEN_TIME
+        
+        vehicle_types = agg['vehicle_types']
+        for v_type, count in record.get('vehicle_stats', {}).items():
+            if v_type != 'total':
+                vehicle_types[v_type] += count
     
-    def _save_cycle_data(self):
-        """Save cycle data to file"""
+    def _append_cycle_record(self, record: Dict):
+        """Append a single cycle record to the data file"""
         try:
-            with open(self.cycle_data_file, 'w') as f:
-                json.dump(self.cycle_data, f, indent=2)
+            with open(self.cycle_data_file, 'ab') as f:
+                f.write(_json_dumps(record) + b"\n")
+            # The record is already in memory, so this write alone doesn't need a reload
+            self._cycle_data_signature = _file_signature(self.cycle_data_file)
         except Exception as e:
-            self.logger.error(f"Could not save cycle data: {e}")
+            self.logger.error("Could not save cycle data: %s", e)
+    
+    def _write_result_image(self, path: str, image):
+        """Encode and save a detection result image (runs on the I/O thread)"""
+        try:
+            if not cv2.imwrite(path, image, RESULT_JPEG_PARAMS):
+                self.logger.error("Could not save detection result: %s", path)
+        except Exception as e:
+            self.logger.error("Could not save detection result %s: %s", path, e)
     
     def initialize(self) -> bool:
         """
@@ -95,143 +281,312 @@ class TrafficManagementSystem:
             
             # Initialize vehicle detector
             self.logger.info("Initializing vehicle detector...")
-            self.detector = VehicleDetector()
+            self.detector = VehicleDetector(engine_path=self.engine_path,
+                                            onnx_path=self.onnx_path)
             
             # Initialize traffic signal controller
             self.logger.info("Initializing traffic signal controller...")
-            self.controller = TrafficSignalController()
+            self.controller = TrafficSignalController(io_executor=self._io_pool)
             
             self.logger.info("System initialization complete!")
             return True
             
         except Exception as e:
-            self.logger.error(f"Initialization failed: {e}")
+            self.logger.error("Initialization failed: %s", e)
             return False
     
-    def run_single_cycle(self) -> Optional[Dict]:
+    def _capture_stage(self, copy: bool = False) -> Dict:
         """
-        Run a single traffic management cycle
+        Step 1 of a cycle: capture a frame
         
+        Args:
+            copy: Take a frame the caller owns; needed when the next capture
+                can start before this frame has been processed
+            
         Returns:
-            Dictionary with cycle results or None if failed
+            Cycle context with the frame and its capture metadata
         """
-        try:
-            cycle_start = time.time()
-            timestamp = datetime.now()
-            
-            self.logger.info(f"\n{'='*60}")
-            self.logger.info(f"Starting traffic cycle at {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-            self.logger.info(f"{'='*60}")
-            
-            # Step 1: Capture image
-            self.logger.info("Step 1: Capturing image from camera...")
-            image_path = self.camera.capture_single_image()
-            
-            if not image_path:
-                raise RuntimeError("Failed to capture image")
-            
-            self.logger.info(f"Image captured: {image_path}")
+        cycle_start = time.time()
+        timestamp = datetime.now()
+        
+        self.logger.info("\n%s", SEPARATOR)
+        self.logger.info("Starting traffic cycle at %s", timestamp.strftime('%Y-%m-%d %H:%M:%S'))
+        self.logger.info(SEPARATOR)
+        
+        # Step 1: Capture image
+        self.logger.info("Step 1: Capturing image from camera...")
+        # Keep the decoded frame so detection does not have to read the file back;
+        # the pooled buffer is safe to use until the next capture (live mode
+        # always hands back a copy)
+        image, image_path = self.camera.capture_frame_and_persist(copy=copy)
+        
+        if image is None or not image_path:
+            raise RuntimeError("Failed to capture image")
+        
+        self.logger.info("Image captured: %s", image_path)
+        
+        return {
+            "cycle_start": cycle_start,
+            "timestamp": timestamp,
+            "image": image,
+            "image_path": image_path
+        }
+    
+    def _detect_stage(self, ctx: Dict) -> Dict:
+        """
+        Step 2 of a cycle: detect vehicles and queue the annotated image
+        
+        Args:
+            ctx: Cycle context from _capture_stage, updated in place
             
-            # Step 2: Detect vehicles
-            self.logger.info("Step 2: Detecting vehicles in image...")
-            import cv2
-            image = cv2.imread(image_path)
-            vehicles = self.detector.detect_vehicles(image)
+        Returns:
+            The cycle context with detection results added
+        """
+        image = ctx["image"]
+        image_path = ctx["image_path"]
+        
+        # Step 2: Detect vehicles
+        self.logger.info("Step 2: Detecting vehicles in image...")
+        frame_hash = None if self.always_detect else _scene_hash(image)
+        distance = (bin(frame_hash ^ self._last_hash).count('1')
+                    if frame_hash is not None and self._last_hash is not None else None)
+        
+        if (distance is not None and distance <= SCENE_HASH_MAX_DISTANCE
+                and self._reuse_count < SCENE_REUSE_MAX_CYCLES):
+            # Static scene (red light, empty road at night): skip the CNN. The
+            # coarse hash can miss a few small vehicles moving, so the reuse
+            # streak is capped and the detector reruns every few cycles
+            self._reuse_count += 1
+            self.logger.info("Scene unchanged (hash distance %d), reusing previous detections (%d/%d)",
+                             distance, self._reuse_count, SCENE_REUSE_MAX_CYCLES)
+            vehicles = self._last_vehicles
+            stats = dict(self._last_stats)
+        else:
+            vehicles = self.detector.detect(image)
             stats = self.detector.get_vehicle_statistics(vehicles)
-            
-            self.logger.info(f"Detected {stats['total']} total vehicles:")
+            self._last_hash = frame_hash
+            self._last_vehicles = vehicles
+            self._last_stats = stats
+            self._reuse_count = 0
+        
+        self.logger.info("Detected %d total vehicles:", stats['total'])
+        if self.logger.isEnabledFor(logging.INFO):
             for vehicle_type, count in stats.items():
                 if vehicle_type != 'total' and count > 0:
-                    self.logger.info(f"  - {vehicle_type.capitalize()}: {count}")
-            
-            # Save detection result image
-            result_image = self.detector.draw_detections(image, vehicles)
-            result_path = str(Path(image_path).parent / f"detected_{Path(image_path).name}")
-            cv2.imwrite(result_path, result_image)
-            self.logger.info(f"Detection result saved: {result_path}")
-            
-            # Step 3: Calculate signal timing
-            self.logger.info(f"Step 3: Calculating signal timing using {self.algorithm} algorithm...")
-            timing = self.controller.calculate_signal_timing(
-                vehicle_stats=stats,
-                algorithm=self.algorithm
-            )
-            
-            self.logger.info(f"Signal Timing Calculated:")
-            self.logger.info(f"  - Green: {timing.green_time}s")
-            self.logger.info(f"  - Yellow: {timing.yellow_time}s")
-            self.logger.info(f"  - All-Red: {timing.all_red_time}s")
-            self.logger.info(f"  - Total Cycle: {timing.total_cycle_time}s")
-            
-            # Step 4: Create cycle record
-            cycle_time = time.time() - cycle_start
-            
-            cycle_record = {
-                "timestamp": timestamp.isoformat(),
-                "image_path": image_path,
-                "result_path": result_path,
-                "vehicle_count": stats['total'],
-                "vehicle_stats": stats,
-                "weighted_count": timing.weighted_vehicle_count,
-                "green_time": timing.green_time,
-                "yellow_time": timing.yellow_time,
-                "all_red_time": timing.all_red_time,
-                "total_cycle_time": timing.total_cycle_time,
-                "algorithm": self.algorithm,
-                "processing_time": round(cycle_time, 2)
-            }
-            
-            # Save cycle data
-            self.cycle_data.append(cycle_record)
-            self._save_cycle_data()
-            
-            self.logger.info(f"Cycle completed in {cycle_time:.2f}s")
-            self.logger.info(f"{'='*60}\n")
+                    self.logger.info("  - %s: %d", vehicle_type.capitalize(), count)
+        
+        # Save detection result image
+        result_image = self.detector.draw_detections(image, vehicles)
+        # Always JPEG: annotated copies don't need the capture's format, and PNG
+        # would cost a slow zlib pass per cycle
+        result_path = str(Path(image_path).parent / f"detected_{Path(image_path).stem}.jpg")
+        self._io_pool.submit(self._write_result_image, result_path, result_image)
+        self.logger.info("Detection result queued: %s", result_path)
+        
+        ctx["stats"] = stats
+        ctx["result_path"] = result_path
+        return ctx
+    
+    def _finish_cycle(self, ctx: Dict) -> Dict:
+        """
+        Steps 3 and 4 of a cycle: calculate signal timing and record the cycle
+        
+        Args:
+            ctx: Cycle context from _detect_stage
             
-            return cycle_record
+        Returns:
+            Dictionary with cycle results
+        """
+        stats = ctx["stats"]
+        
+        # Step 3: Calculate signal timing
+        self.logger.info("Step 3: Calculating signal timing using %s algorithm...", self.algorithm)
+        timing = self.controller.calculate_signal_timing(
+            vehicle_stats=stats,
+            algorithm=self.algorithm
+        )
+        
+        self.logger.info("Signal Timing Calculated:")
+        self.logger.info("  - Green: %ds", timing.green_time)
+        self.logger.info("  - Yellow: %ds", timing.yellow_time)
+        self.logger.info("  - All-Red: %ds", timing.all_red_time)
+        self.logger.info("  - Total Cycle: %ds", timing.total_cycle_time)
+        
+        # Step 4: Create cycle record
+        cycle_time = time.time() - ctx["cycle_start"]
+        
+        cycle_record = {
+            "timestamp": ctx["timestamp"].isoformat(),
+            "image_path": ctx["image_path"],
+            "result_path": ctx["result_path"],
+            "vehicle_count": stats['total'],
+            "vehicle_stats": stats,
+            "weighted_count": timing.weighted_vehicle_count,
+            "green_time": timing.green_time,
+            "yellow_time": timing.yellow_time,
+            "all_red_time": timing.all_red_time,
+            "total_cycle_time": timing.total_cycle_time,
+            "algorithm": self.algorithm,
+            "processing_time": round(cycle_time, 2)
+        }
+        
+        # Save cycle data
+        self.cycle_data.append(cycle_record)
+        self._update_aggregates(cycle_record)
+        self._io_pool.submit(self._append_cycle_record, cycle_record)
+        
+        self.logger.info("Cycle completed in %.2fs", cycle_time)
+        self.logger.info("%s\n", SEPARATOR)
+        
+        return cycle_record
+    
+    def run_single_cycle(self) -> Optional[Dict]:
+        """
+        Run a single traffic management cycle
+        
+        Returns:
+            Dictionary with cycle results or None if failed
+        """
+        try:
+            ctx = self._capture_stage()
+            self._detect_stage(ctx)
+            return self._finish_cycle(ctx)
             
         except Exception as e:
-            self.logger.error(f"Cycle failed: {e}")
+            self.logger.error("Cycle failed: %s", e)
             return None
     
     def run_continuous(self, interval: float = 30.0, max_cycles: Optional[int] = None):
         """
         Run continuous traffic management
         
+        Capture, detection and signal timing run as a pipeline, so the next
+        frame is captured while the previous one is still being detected.
+        
         Args:
             interval: Time between cycles in seconds
             max_cycles: Maximum number of cycles (None for infinite)
         """
-        self.logger.info(f"Starting continuous traffic management")
-        self.logger.info(f"Cycle interval: {interval}s")
+        self.logger.info("Starting continuous traffic management")
+        self.logger.info("Cycle interval: %ss", interval)
         if max_cycles:
-            self.logger.info(f"Max cycles: {max_cycles}")
+            self.logger.info("Max cycles: %d", max_cycles)
         
         cycle_count = 0
         
+        # Keep the newest frame in memory so each cycle skips the camera wait
+        self.camera.start_live()
+        
+        frames_q = queue.Queue(maxsize=2)
+        results_q = queue.Queue(maxsize=2)
+        stop_event = threading.Event()
+        # One permit per cycle still to run: capture takes one per frame it
+        # hands off, and frames that never become a cycle give theirs back
+        budget = threading.Semaphore(max_cycles) if max_cycles else None
+        
+        def capture_worker():
+            next_tick = time.monotonic()
+            
+            while not stop_event.is_set():
+                if budget is not None and not budget.acquire(timeout=0.5):
+                    # Enough frames in flight to reach max_cycles. Time spent
+                    # waiting here is not an overrun, so restart the schedule
+                    next_tick = time.monotonic()
+                    continue
+                
+                try:
+                    ctx = self._capture_stage(copy=True)
+                except Exception as e:
+                    self.logger.error("Cycle failed: %s", e)
+                    ctx = None
+                
+                try:
+                    frames_q.put_nowait(ctx)
+                except queue.Full:
+                    # Detection is behind; drop the oldest frame instead of building latency
+                    try:
+                        frames_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    else:
+                        if budget is not None:
+                            budget.release()
+                    frames_q.put_nowait(ctx)
+                
+                # Wait for next cycle, measured from the start of this one so the
+                # period does not drift by the capture time
+                next_tick += interval
+                sleep_for = next_tick - time.monotonic()
+                if sleep_for < 0:
+                    if interval > 0:
+                        self.logger.warning("Cycle overran by %.2fs", -sleep_for)
+                    # Restart the schedule rather than firing catch-up captures back to back
+                    next_tick = time.monotonic()
+                    continue
+                
+                self.logger.info("Waiting %.1fs until next cycle...", sleep_for)
+                stop_event.wait(sleep_for)
+        
+        def detect_worker():
+            while not stop_event.is_set():
+                try:
+                    ctx = frames_q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                
+                if ctx is not None:
+                    try:
+                        self._detect_stage(ctx)
+                    except Exception as e:
+                        self.logger.error("Cycle failed: %s", e)
+                        ctx = None
+                
+                while not stop_event.is_set():
+                    try:
+                        results_q.put(ctx, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+        
+        workers = [
+            threading.Thread(target=capture_worker, daemon=True),
+            threading.Thread(target=detect_worker, daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+        
         try:
-            while True:
-                if max_cycles and cycle_count >= max_cycles:
-                    self.logger.info(f"Reached maximum cycles ({max_cycles})")
-                    break
+            while not (max_cycles and cycle_count >= max_cycles):
+                try:
+                    ctx = results_q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
                 
-                # Run cycle
-                result = self.run_single_cycle()
+                result = None
+                if ctx is not None:
+                    try:
+                        result = self._finish_cycle(ctx)
+                    except Exception as e:
+                        self.logger.error("Cycle failed: %s", e)
                 
                 if result:
                     cycle_count += 1
                 else:
+                    if budget is not None:
+                        budget.release()
                     self.logger.warning("Cycle failed, continuing...")
-                
-                # Wait for next cycle
-                if max_cycles is None or cycle_count < max_cycles:
-                    self.logger.info(f"Waiting {interval}s until next cycle...")
-                    time.sleep(interval)
+            
+            self.logger.info("Reached maximum cycles (%s)", max_cycles)
                 
         except KeyboardInterrupt:
             self.logger.info("\nStopping continuous mode (Ctrl+C pressed)")
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join(timeout=5)
+            self.camera.stop_live()
         
-        self.logger.info(f"Completed {cycle_count} cycles")
+        self.logger.info("Completed %d cycles", cycle_count)
     
     def generate_report(self) -> Dict:
         """
@@ -240,41 +595,30 @@ class TrafficManagementSystem:
         Returns:
             Dictionary with system statistics
         """
-        if not self.cycle_data:
+        agg = self._agg
+        n = agg['n']
+        if not n:
             return {"message": "No data available"}
         
-        total_vehicles = sum(c['vehicle_count'] for c in self.cycle_data)
-        avg_vehicles = total_vehicles / len(self.cycle_data)
-        
-        avg_green = sum(c['green_time'] for c in self.cycle_data) / len(self.cycle_data)
-        avg_processing = sum(c['processing_time'] for c in self.cycle_data) / len(self.cycle_data)
-        
-        # Vehicle type breakdown
-        vehicle_types = {}
-        for cycle in self.cycle_data:
-            for v_type, count in cycle['vehicle_stats'].items():
-                if v_type != 'total':
-                    vehicle_types[v_type] = vehicle_types.get(v_type, 0) + count
-        
         report = {
             "system_info": {
-                "total_cycles": len(self.cycle_data),
+                "total_cycles": n,
                 "algorithm": self.algorithm,
                 "camera_index": self.camera_index
             },
             "traffic_statistics": {
-                "total_vehicles_detected": total_vehicles,
-                "average_vehicles_per_cycle": round(avg_vehicles, 2),
-                "vehicle_type_breakdown": vehicle_types
+                "total_vehicles_detected": agg['total_vehicles'],
+                "average_vehicles_per_cycle": round(agg['total_vehicles'] / n, 2),
+                "vehicle_type_breakdown": dict(agg['vehicle_types'])
             },
             "timing_statistics": {
-                "average_green_time": round(avg_green, 2),
-                "min_green_time": min(c['green_time'] for c in self.cycle_data),
-                "max_green_time": max(c['green_time'] for c in self.cycle_data)
+                "average_green_time": round(agg['total_green'] / n, 2),
+                "min_green_time": agg['min_green'],
+                "max_green_time": agg['max_green']
             },
             "performance": {
-                "average_processing_time": round(avg_processing, 2),
-                "total_time_saved": round(sum(c['green_time'] - 30 for c in self.cycle_data if c['green_time'] > 30), 2)
+                "average_processing_time": round(agg['total_processing'] / n, 2),
+                "total_time_saved": round(agg['time_saved'], 2)
             }
         }
         
@@ -287,15 +631,18 @@ class TrafficManagementSystem:
         if self.camera:
             self.camera.release()
         
+        # Flush pending result images and cycle/history records
+        self._io_pool.shutdown(wait=True)
+        
         # Generate final report
         if self.cycle_data:
             report = self.generate_report()
             report_path = self.data_dir / f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2)
+            with open(report_path, 'wb') as f:
+                f.write(_json_dumps(report, indent=True))
             
-            self.logger.info(f"Final report saved: {report_path}")
+            self.logger.info("Final report saved: %s", report_path)
         
         self.logger.info("Shutdown complete")
 
@@ -331,13 +678,28 @@ def main():
         '--report', action='store_true',
         help='Generate report from existing data and exit'
     )
+    parser.add_argument(
+        '--always-detect', action='store_true',
+        help='Run detection on every frame instead of reusing results for unchanged scenes'
+    )
+    parser.add_argument(
+        '--engine',
+        help='Serialized TensorRT engine to use for detection (optional)'
+    )
+    parser.add_argument(
+        '--onnx',
+        help='YOLOv8 ONNX model to use for detection via ONNX Runtime (optional)'
+    )
     
     args = parser.parse_args()
     
     # Create system instance
     system = TrafficManagementSystem(
         camera_index=args.camera,
-        algorithm=args.algorithm
+        algorithm=args.algorithm,
+        always_detect=args.always_detect,
+        engine_path=args.engine,
+        onnx_path=args.onnx
     )
     
     try:
@@ -349,7 +711,7 @@ def main():
             print("\n" + "="*60)
             print("TRAFFIC MANAGEMENT SYSTEM REPORT")
             print("="*60)
-            print(json.dumps(report, indent=2))
+            print(_json_dumps(report, indent=True).decode('utf-8'))
             print("="*60 + "\n")
             
             return
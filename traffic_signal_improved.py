@@ -1,13 +1,86 @@
 import json
+import sys
 import time
+import collections
+import math
 from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor
+from dataclasses import dataclass, fields
 from pathlib import Path
-import statistics
+import numpy as np
 
+try:
+    import orjson
+except ImportError:  # Optional: Rust-backed JSON (de)serializer
+    orjson = None
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:  # Optional: compiles the adaptive timing kernel
+    njit = None
+
+
+# Bound once so the logarithmic algorithm skips the module attribute lookup
+_log = math.log
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Number of recent cycles averaged by the adaptive algorithm
+ADAPTIVE_WINDOW = 20
+# Number of recent cycles summarized by get_statistics
+STATS_WINDOW = 50
+# Number of (algorithm, count) -> green time results kept, oldest evicted first
+TIMING_CACHE_SIZE = 32
+
+
+def _linear_green_time(vehicle_count: float, base_green_time: int, vehicle_multiplier: float,
+                       min_green_time: int, max_green_time: int) -> int:
+    """Linear timing; depends only on the count and timing config"""
+    green_time = base_green_time + (vehicle_count * vehicle_multiplier)
+    return max(min_green_time, min(max_green_time, int(green_time)))
+
+
+def _logarithmic_green_time(vehicle_count: float, base_green_time: int, vehicle_multiplier: float,
+                            min_green_time: int, max_green_time: int) -> int:
+    """Logarithmic timing; depends only on the count and timing config"""
+    if vehicle_count <= 0:
+        return min_green_time
+    
+    # Use logarithmic scaling for better handling of high volumes
+    green_time = base_green_time + (15 * _log(vehicle_count + 1))
+    return max(min_green_time, min(max_green_time, int(green_time)))
+
+
+def _adaptive_core(recent_wvc: np.ndarray, n: int, vehicle_count: float, base_time: int,
+                   min_green_time: int, max_green_time: int) -> int:
+    """
+    Adjust a linear green time against the recent weighted-count average
+    
+    Written as a plain loop over the ring buffer so Numba can compile it;
+    without Numba it runs as ordinary Python.
+    """
+    if n >= 10:
+        total = 0.0
+        for i in range(n):
+            total += recent_wvc[i]
+        avg_vehicles = total / n
+        
+        # If current count is significantly higher than average, increase time
+        if vehicle_count > avg_vehicles * 1.5:
+            base_time = int(base_time * 1.2)
+        elif vehicle_count < avg_vehicles * 0.5:
+            base_time = int(base_time * 0.8)
+    
+    return max(min_green_time, min(max_green_time, base_time))
+
+
+if njit is not None:
+    _adaptive_core = njit(cache=True)(_adaptive_core)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class TrafficSignalConfig:
     """Configuration for traffic signal timing"""
     min_green_time: int = 15  # Minimum green time in seconds
@@ -24,7 +97,7 @@ class TrafficSignalConfig:
     truck_weight: float = 1.5
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class SignalTiming:
     """Traffic signal timing result"""
     green_time: int
@@ -33,45 +106,178 @@ class SignalTiming:
     total_cycle_time: int
     vehicle_count: int
     weighted_vehicle_count: float
-    timestamp: str
+    timestamp: float  # Unix epoch seconds
     algorithm: str
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """Timestamp as an ISO 8601 local time string, for display and reports"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+
+# Field names of SignalTiming, in declaration order, for serialization
+_TIMING_FIELDS = tuple(f.name for f in fields(SignalTiming))
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for path, or None if it does not exist"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 class TrafficSignalController:
     """Intelligent traffic signal controller with multiple algorithms"""
     
-    def __init__(self, config: Optional[TrafficSignalConfig] = None):
+    def __init__(self, config: Optional[TrafficSignalConfig] = None,
+                 io_executor: Optional[Executor] = None):
         """
         Initialize traffic signal controller
         
         Args:
             config: Traffic signal configuration
+            io_executor: Executor to run history file writes on (optional);
+                a single-worker executor keeps records in order. Writes
+                happen inline when omitted.
         """
         self.config = config or TrafficSignalConfig()
+        self._io_executor = io_executor
         self.history: List[SignalTiming] = []
-        self.history_file = Path("signal_timing_history.json")
+        # One JSON record per line, so each new timing is a constant-time append
+        self.history_file = Path("signal_timing_history.jsonl")
+        self.legacy_history_file = Path("signal_timing_history.json")
+        # (mtime_ns, size) of history_file as of the in-memory history
+        self._history_signature: Optional[Tuple[int, int]] = None
+        
+        # Per-type weights, fixed for the lifetime of the controller
+        self._weights = (
+            self.config.car_weight,
+            self.config.motorcycle_weight,
+            self.config.bus_weight,
+            self.config.truck_weight
+        )
+        # Timing parameters passed to the algorithm functions
+        self._timing_params = (
+            self.config.base_green_time,
+            self.config.vehicle_multiplier,
+            self.config.min_green_time,
+            self.config.max_green_time
+        )
+        # Small FIFO memo for the history-independent algorithms; the config is
+        # fixed per controller, so (algorithm, count) fully determines the result
+        self._timing_cache: collections.OrderedDict = collections.OrderedDict()
+        
+        # Algorithm dispatch table, bound once instead of rebuilt per call
+        self._algorithms = {
+            'linear': self.linear_algorithm,
+            'logarithmic': self.logarithmic_algorithm,
+            'adaptive': self.adaptive_algorithm
+        }
+        
+        # Ring buffers over recent cycles so the adaptive algorithm and
+        # get_statistics never rebuild lists from self.history
+        self._recent_wvc = np.zeros(ADAPTIVE_WINDOW, dtype=np.float64)
+        self._recent_idx = 0
+        self._recent_n = 0
+        self._stats_green = np.zeros(STATS_WINDOW, dtype=np.int64)
+        self._stats_vehicles = np.zeros(STATS_WINDOW, dtype=np.int64)
+        self._stats_idx = 0
+        self._stats_n = 0
         
         # Load existing history
         self._load_history()
     
     def _load_history(self):
         """Load signal timing history from file"""
-        if self.history_file.exists():
+        if not self.history_file.exists() and self.legacy_history_file.exists():
+            self._migrate_legacy_history()
+        
+        signature = _file_signature(self.history_file)
+        if signature is not None and signature == self._history_signature:
+            return  # Unchanged since the last load or our own last append
+        
+        if signature is not None:
             try:
-                with open(self.history_file, 'r') as f:
-                    data = json.load(f)
-                    self.history = [SignalTiming(**item) for item in data]
+                history = []
+                loads = orjson.loads if orjson is not None else json.loads
+                with open(self.history_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = loads(line)
+                            if isinstance(record['timestamp'], str):
+                                # Older versions stored ISO 8601 strings
+                                record['timestamp'] = datetime.fromisoformat(record['timestamp']).timestamp()
+                            history.append(SignalTiming(**record))
+                        except ValueError:
+                            # A crash mid-append can leave a truncated last line
+                            print("Warning: Skipping malformed history record")
+                self.history = history
+                self._history_signature = signature
+                
+                self._recent_idx = self._recent_n = 0
+                self._stats_idx = self._stats_n = 0
+                for timing in history[-STATS_WINDOW:]:
+                    self._record_recent(timing)
             except Exception as e:
                 print(f"Warning: Could not load history: {e}")
     
-    def _save_history(self):
-        """Save signal timing history to file"""
+    def _migrate_legacy_history(self):
+        """Convert a signal_timing_history.json array from older versions to JSON Lines"""
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump([asdict(t) for t in self.history], f, indent=2)
+            with open(self.legacy_history_file, 'rb') as f:
+                data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+            
+            tmp_file = self.history_file.with_suffix('.jsonl.tmp')
+            with open(tmp_file, 'wb') as f:
+                for item in data:
+                    f.write(self._dump_record(item))
+            tmp_file.replace(self.history_file)
+        except Exception as e:
+            print(f"Warning: Could not migrate legacy history: {e}")
+    
+    def _append_history(self, timing: SignalTiming):
+        """Append a single timing record to the history file"""
+        if self._io_executor is not None:
+            self._io_executor.submit(self._write_history_record, timing)
+        else:
+            self._write_history_record(timing)
+    
+    def _write_history_record(self, timing: SignalTiming):
+        """Write one timing record to the history file"""
+        try:
+            with open(self.history_file, 'ab') as f:
+                f.write(self._dump_record(timing))
+            # The timing is already in memory, so this write alone doesn't need a reload
+            self._history_signature = _file_signature(self.history_file)
         except Exception as e:
             print(f"Warning: Could not save history: {e}")
     
+    def _record_recent(self, timing: SignalTiming):
+        """Push a timing into the recent-cycle ring buffers"""
+        self._recent_wvc[self._recent_idx] = timing.weighted_vehicle_count
+        self._recent_idx = (self._recent_idx + 1) % ADAPTIVE_WINDOW
+        self._recent_n = min(self._recent_n + 1, ADAPTIVE_WINDOW)
+        
+        self._stats_green[self._stats_idx] = timing.green_time
+        self._stats_vehicles[self._stats_idx] = timing.vehicle_count
+        self._stats_idx = (self._stats_idx + 1) % STATS_WINDOW
+        self._stats_n = min(self._stats_n + 1, STATS_WINDOW)
+    
+    @staticmethod
+    def _dump_record(record) -> bytes:
+        """Serialize a dict or SignalTiming as one newline-terminated JSON line"""
+        if orjson is not None:
+            # orjson serializes dataclasses natively, no asdict() copy needed
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        if isinstance(record, SignalTiming):
+            # Flat record: a shallow field copy instead of asdict()'s recursive deepcopy
+            record = {name: getattr(record, name) for name in _TIMING_FIELDS}
+        return (json.dumps(record) + "\n").encode('utf-8')
+    
     def calculate_weighted_vehicles(self, vehicle_stats: Dict[str, int]) -> float:
         """
         Calculate weighted vehicle count based on vehicle types
@@ -82,19 +288,10 @@ class TrafficSignalController:
         Returns:
             Weighted vehicle count
         """
-        weights = {
-            'car': self.config.car_weight,
-            'motorcycle': self.config.motorcycle_weight,
-            'bus': self.config.bus_weight,
-            'truck': self.config.truck_weight
-        }
-        
-        weighted_count = 0.0
-        for vehicle_type, count in vehicle_stats.items():
-            if vehicle_type in weights:
-                weighted_count += count * weights[vehicle_type]
-        
-        return weighted_count
+        get = vehicle_stats.get
+        car, motorcycle, bus, truck = self._weights
+        return float(get('car', 0) * car + get('motorcycle', 0) * motorcycle +
+                     get('bus', 0) * bus + get('truck', 0) * truck)
     
     def linear_algorithm(self, vehicle_count: float) -> int:
         """
@@ -106,8 +303,7 @@ class TrafficSignalController:
         Returns:
             Green signal time in seconds
         """
-        green_time = self.config.base_green_time + (vehicle_count * self.config.vehicle_multiplier)
-        return self._clamp_time(int(green_time))
+        return self._cached_green_time('linear', _linear_green_time, vehicle_count)
     
     def logarithmic_algorithm(self, vehicle_count: float) -> int:
         """
@@ -120,13 +316,7 @@ class TrafficSignalController:
         Returns:
             Green signal time in seconds
         """
-        import math
-        if vehicle_count <= 0:
-            return self.config.min_green_time
-        
-        # Use logarithmic scaling for better handling of high volumes
-        green_time = self.config.base_green_time + (15 * math.log(vehicle_count + 1))
-        return self._clamp_time(int(green_time))
+        return self._cached_green_time('logarithmic', _logarithmic_green_time, vehicle_count)
     
     def adaptive_algorithm(self, vehicle_count: float) -> int:
         """
@@ -139,26 +329,25 @@ class TrafficSignalController:
         Returns:
             Green signal time in seconds
         """
-        # Start with linear calculation
+        # Start with linear calculation (cached; the history adjustment below is not,
+        # since the recent average changes with every recorded cycle)
         base_time = self.linear_algorithm(vehicle_count)
         
-        # Adjust based on historical data if available
-        if len(self.history) >= 10:
-            recent_history = self.history[-20:]
-            avg_vehicles = statistics.mean([h.weighted_vehicle_count for h in recent_history])
-            
-            # If current count is significantly higher than average, increase time
-            if vehicle_count > avg_vehicles * 1.5:
-                base_time = int(base_time * 1.2)
-            elif vehicle_count < avg_vehicles * 0.5:
-                base_time = int(base_time * 0.8)
-        
-        return self._clamp_time(base_time)
+        # Adjust based on historical data once at least 10 cycles are recorded
+        return int(_adaptive_core(self._recent_wvc, self._recent_n, float(vehicle_count), base_time,
+                                  self.config.min_green_time, self.config.max_green_time))
     
-    def _clamp_time(self, time_seconds: int) -> int:
-        """Ensure time is within configured bounds"""
-        return max(self.config.min_green_time, 
-                   min(self.config.max_green_time, time_seconds))
+    def _cached_green_time(self, algorithm: str, func, vehicle_count: float) -> int:
+        """Look up or compute a green time in the FIFO timing cache"""
+        key = (algorithm, vehicle_count)
+        cache = self._timing_cache
+        green_time = cache.get(key)
+        if green_time is None:
+            green_time = func(vehicle_count, *self._timing_params)
+            cache[key] = green_time
+            if len(cache) > TIMING_CACHE_SIZE:
+                cache.popitem(last=False)
+        return green_time
     
     def calculate_signal_timing(self, 
                                vehicle_count: int = None,
@@ -184,16 +373,11 @@ class TrafficSignalController:
             total_count = vehicle_count or 0
         
         # Select algorithm
-        algorithms = {
-            'linear': self.linear_algorithm,
-            'logarithmic': self.logarithmic_algorithm,
-            'adaptive': self.adaptive_algorithm
-        }
-        
-        if algorithm not in algorithms:
+        algorithm_func = self._algorithms.get(algorithm)
+        if algorithm_func is None:
             raise ValueError(f"Unknown algorithm: {algorithm}")
         
-        green_time = algorithms[algorithm](weighted_count)
+        green_time = algorithm_func(weighted_count)
         
         # Create timing result
         timing = SignalTiming(
@@ -203,13 +387,14 @@ class TrafficSignalController:
             total_cycle_time=green_time + self.config.yellow_time + self.config.all_red_time,
             vehicle_count=total_count,
             weighted_vehicle_count=weighted_count,
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time(),
             algorithm=algorithm
         )
         
         # Add to history
         self.history.append(timing)
-        self._save_history()
+        self._record_recent(timing)
+        self._append_history(timing)
         
         return timing
     
@@ -218,24 +403,24 @@ class TrafficSignalController:
         if not self.history:
             return {"message": "No historical data available"}
         
-        recent = self.history[-50:]  # Last 50 cycles
+        n = self._stats_n
+        green = self._stats_green[:n]
+        vehicles = self._stats_vehicles[:n]
+        extra_green = green - self.config.base_green_time
         
         return {
             "total_cycles": len(self.history),
-            "recent_cycles": len(recent),
-            "avg_green_time": statistics.mean([h.green_time for h in recent]),
-            "avg_vehicle_count": statistics.mean([h.vehicle_count for h in recent]),
-            "max_green_time": max([h.green_time for h in recent]),
-            "min_green_time": min([h.green_time for h in recent]),
-            "total_wait_time_saved": sum([h.green_time - self.config.base_green_time 
-                                         for h in recent if h.green_time > self.config.base_green_time])
+            "recent_cycles": n,
+            "avg_green_time": float(green.mean()),
+            "avg_vehicle_count": float(vehicles.mean()),
+            "max_green_time": int(green.max()),
+            "min_green_time": int(green.min()),
+            "total_wait_time_saved": int(extra_green[extra_green > 0].sum())
         }
 
 
 def main():
     """Main function to calculate and display signal timing"""
-    import sys
-    
     # Initialize controller
     controller = TrafficSignalController()
     
@@ -264,7 +449,7 @@ def main():
             print("TRAFFIC SIGNAL TIMING CALCULATION")
             print("="*60)
             print(f"\nAlgorithm Used: {timing.algorithm.upper()}")
-            print(f"Timestamp: {timing.timestamp}")
+            print(f"Timestamp: {timing.iso_timestamp}")
             print(f"\nVehicle Count: {timing.vehicle_count}")
             print(f"Weighted Count: {timing.weighted_vehicle_count:.1f}")
             print(f"\n--- Signal Phases ---")
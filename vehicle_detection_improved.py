@@ -1,11 +1,564 @@
 import cv2
+import mmap
 import numpy as np
 import os
-from typing import List, Tuple, Dict
+import queue
+import sys
+import threading
+from collections import Counter
+from typing import List, Tuple, Dict, Optional, Union, Iterable, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:  # Optional: compiles the detection filter kernel
+    njit = None
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optional: runs YOLOv8 ONNX models
+    ort = None
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# YOLOv3 network input size
+INPUT_SIZE = 416
+# Input size assumed for YOLOv8 ONNX models exported with a dynamic shape
+YOLOV8_DEFAULT_INPUT_SIZE = 640
+# Batch sizes the TensorRT optimization profile is tuned for
+ENGINE_MIN_BATCH, ENGINE_OPT_BATCH, ENGINE_MAX_BATCH = 1, 8, 16
+# Candidate boxes passed to NMS, and detections kept per image
+NMS_CANDIDATES = 200
+MAX_DETECTIONS = 100
+# INT8 calibration: frames per calibration batch, and frames used in total
+CALIBRATION_BATCH_SIZE = ENGINE_OPT_BATCH
+CALIBRATION_MAX_IMAGES = 500
+# Images per forward pass when processing a directory
+DIRECTORY_BATCH_SIZE = 8
+# Batches allowed in flight between the read, detect and write stages
+PIPELINE_DEPTH = 4
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+# Where a single-image run saves its result when no window can be shown
+DEFAULT_RESULT_PATH = "detected_vehicles.jpg"
+
+# Box colors (BGR) for each vehicle type
+DETECTION_COLORS = {
+    'car': (0, 255, 0),      # Green
+    'motorcycle': (255, 0, 0),  # Blue
+    'bus': (0, 0, 255),      # Red
+    'truck': (255, 255, 0)   # Cyan
+}
+DEFAULT_DETECTION_COLOR = (0, 255, 0)
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_FONT_SCALE = 0.5
+
+
+@lru_cache(maxsize=1024)
+def _label_size(label: str) -> Tuple[int, int]:
+    """Rendered (width, height) of a detection label"""
+    (label_w, label_h), _ = cv2.getTextSize(label, LABEL_FONT, LABEL_FONT_SCALE, 1)
+    return label_w, label_h
+
+
+def _filter_rows(rows: np.ndarray, conf_threshold: np.float32,
+                 vehicle_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Select YOLO rows whose best class is a vehicle above the threshold
+    
+    Args:
+        rows: (N, 5 + classes) detection rows
+        conf_threshold: Minimum class score (same dtype as the scores)
+        vehicle_mask: Boolean per class id, True for vehicle classes
+        
+    Returns:
+        Tuple of (row indices, class ids, confidences) of the kept rows
+    """
+    n = rows.shape[0]
+    num_classes = rows.shape[1] - 5
+    keep = np.empty(n, dtype=np.int64)
+    class_ids = np.empty(n, dtype=np.int64)
+    confidences = np.empty(n, dtype=rows.dtype)
+    count = 0
+    
+    for i in range(n):
+        # First maximum wins, like np.argmax
+        best = 0
+        best_score = rows[i, 5]
+        for j in range(1, num_classes):
+            if rows[i, 5 + j] > best_score:
+                best = j
+                best_score = rows[i, 5 + j]
+        
+        if best_score > conf_threshold and vehicle_mask[best]:
+            keep[count] = i
+            class_ids[count] = best
+            confidences[count] = best_score
+            count += 1
+    
+    return keep[:count], class_ids[:count], confidences[:count]
+
+
+# The row filter is only worth using compiled; without Numba the NumPy path is used
+if njit is not None:
+    _filter_rows = njit(cache=True)(_filter_rows)
+else:
+    _filter_rows = None
+
+
+def _filter_rows_numpy(rows: np.ndarray, conf_threshold: float,
+                       vehicle_classes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NumPy version of _filter_rows, used when Numba is not installed
+    
+    Args:
+        rows: (N, 5 + classes) detection rows
+        conf_threshold: Minimum class score
+        vehicle_classes: Class ids that count as vehicles
+        
+    Returns:
+        Tuple of (row indices, class ids, confidences) of the kept rows
+    """
+    scores = rows[:, 5:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), class_ids]
+    
+    # Filter for vehicles only
+    keep = np.flatnonzero((confidences > conf_threshold) & np.isin(class_ids, vehicle_classes))
+    return keep, class_ids[keep], confidences[keep]
+
+
+def _preprocess_416(resized: np.ndarray, dst: np.ndarray):
+    """
+    Convert a resized BGR frame into a normalized RGB CHW blob in one pass
+    
+    Fuses the channel swap, 1/255 scaling and HWC->CHW transpose that
+    blobFromImage does as separate passes. The 416x416 shape is fixed so the
+    compiled loops have constant bounds.
+    
+    Args:
+        resized: (416, 416, 3) uint8 BGR image
+        dst: (3, 416, 416) float32 output
+    """
+    scale = np.float32(1 / 255.0)
+    for y in range(INPUT_SIZE):
+        for x in range(INPUT_SIZE):
+            dst[0, y, x] = resized[y, x, 2] * scale
+            dst[1, y, x] = resized[y, x, 1] * scale
+            dst[2, y, x] = resized[y, x, 0] * scale
+
+
+if njit is not None:
+    _preprocess_416 = njit(cache=True)(_preprocess_416)
+else:
+    _preprocess_416 = None
+
+
+def _import_tensorrt():
+    """
+    Import TensorRT and PyCUDA on first use (optional dependencies)
+    
+    Returns:
+        Tuple of (tensorrt module, pycuda.driver module)
+    """
+    try:
+        import tensorrt as trt
+        import pycuda.driver as cuda
+    except ImportError as e:
+        raise RuntimeError(
+            "TensorRT engine support needs the tensorrt and pycuda packages"
+        ) from e
+    cuda.init()
+    return trt, cuda
+
+
+_CUDA_CONTEXT = None
+
+
+def _cuda_context():
+    """
+    Get the primary CUDA context of device 0
+    
+    The primary context is the one the CUDA runtime (TensorRT, OpenCV)
+    uses, so buffers allocated through PyCUDA in it are valid for both. It
+    must be pushed on whichever thread uses it, e.g. the detection worker.
+    
+    Returns:
+        pycuda.driver.Context
+    """
+    global _CUDA_CONTEXT
+    if _CUDA_CONTEXT is None:
+        _, cuda = _import_tensorrt()
+        _CUDA_CONTEXT = cuda.Device(0).retain_primary_context()
+    return _CUDA_CONTEXT
+
+
+def _gpu_preprocess_available() -> bool:
+    """Check whether OpenCV was built with the CUDA modules the device-side preprocessing needs"""
+    try:
+        return (cv2.cuda.getCudaEnabledDeviceCount() > 0
+                and all(hasattr(cv2.cuda, name)
+                        for name in ('createGpuMatFromCudaMemory', 'cvtColor', 'split')))
+    except cv2.error:
+        return False
+
+
+def _int8_calibrator(image_paths: List[str], cache_path: str):
+    """
+    Create a TensorRT INT8 entropy calibrator over a set of sample images
+    
+    Args:
+        image_paths: Representative frames (e.g. earlier captures)
+        cache_path: Calibration table file; reused instead of recalibrating
+            when it already exists
+        
+    Returns:
+        trt.IInt8EntropyCalibrator2 instance
+    """
+    trt, cuda = _import_tensorrt()
+    
+    class _Calibrator(trt.IInt8EntropyCalibrator2):
+        def __init__(self):
+            trt.IInt8EntropyCalibrator2.__init__(self)
+            self.image_paths = list(image_paths)
+            self.index = 0
+            self.device_input = cuda.mem_alloc(
+                CALIBRATION_BATCH_SIZE * 3 * INPUT_SIZE * INPUT_SIZE * np.dtype(np.float32).itemsize
+            )
+        
+        def get_batch_size(self):
+            return CALIBRATION_BATCH_SIZE
+        
+        def get_batch(self, names):
+            images = []
+            while not images and self.index < len(self.image_paths):
+                batch_paths = self.image_paths[self.index:self.index + CALIBRATION_BATCH_SIZE]
+                self.index += CALIBRATION_BATCH_SIZE
+                images = [img for img in (cv2.imread(p) for p in batch_paths) if img is not None]
+            if not images:
+                return None
+            
+            # The batch size is fixed, so pad a short final batch with its last frame
+            images += [images[-1]] * (CALIBRATION_BATCH_SIZE - len(images))
+            blob = cv2.dnn.blobFromImages(
+                images, 1/255.0, (INPUT_SIZE, INPUT_SIZE),
+                swapRB=True, crop=False
+            )
+            cuda.memcpy_htod(self.device_input, np.ascontiguousarray(blob))
+            return [int(self.device_input)]
+        
+        def read_calibration_cache(self):
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    return f.read()
+            return None
+        
+        def write_calibration_cache(self, cache):
+            with open(cache_path, 'wb') as f:
+                f.write(cache)
+    
+    return _Calibrator()
+
+
+def build_engine(onnx_path: str, engine_path: str, fp16: bool = True,
+                 calibration_dir: Optional[str] = None) -> str:
+    """
+    Build a serialized TensorRT engine from an ONNX export of the detector
+    
+    The ONNX model must take a float32 NCHW (N, 3, 416, 416) RGB blob scaled
+    to [0, 1] and return YOLO detection rows (cx, cy, w, h, objectness,
+    80 class scores) with box coordinates normalized to the image, the same
+    layout OpenCV's Darknet importer produces.
+    
+    Args:
+        onnx_path: Path to the ONNX model
+        engine_path: Where to write the serialized engine
+        fp16: Build FP16 kernels when the GPU supports them
+        calibration_dir: Directory of sample frames (e.g. traffic_data/captures)
+            to calibrate INT8 kernels with (optional). The calibration table
+            is cached as <engine_path>.calib and reused by later builds.
+        
+    Returns:
+        engine_path
+    """
+    trt, _ = _import_tensorrt()
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+    parser = trt.OnnxParser(network, logger)
+    
+    with open(onnx_path, 'rb') as f:
+        if not parser.parse(f.read()):
+            errors = "; ".join(str(parser.get_error(i)) for i in range(parser.num_errors))
+            raise RuntimeError(f"Failed to parse ONNX model: {errors}")
+    
+    config = builder.create_builder_config()
+    config.set_memory_pool_limit(trt.MemoryPoolType.WORKSPACE, 1 << 30)
+    if fp16 and builder.platform_has_fast_fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+    
+    # Dynamic batch so single frames and batches share one engine
+    input_name = network.get_input(0).name
+    profile = builder.create_optimization_profile()
+    profile.set_shape(input_name,
+                      (ENGINE_MIN_BATCH, 3, INPUT_SIZE, INPUT_SIZE),
+                      (ENGINE_OPT_BATCH, 3, INPUT_SIZE, INPUT_SIZE),
+                      (ENGINE_MAX_BATCH, 3, INPUT_SIZE, INPUT_SIZE))
+    config.add_optimization_profile(profile)
+    
+    # The calibrator allocates and copies through PyCUDA on this thread
+    cuda_context = _cuda_context() if calibration_dir is not None else None
+    if cuda_context is not None:
+        cuda_context.push()
+    try:
+        serialized = _build_serialized(builder, network, config, profile, engine_path,
+                                       calibration_dir)
+    finally:
+        if cuda_context is not None:
+            cuda_context.pop()
+    if serialized is None:
+        raise RuntimeError("TensorRT engine build failed")
+    
+    with open(engine_path, 'wb') as f:
+        f.write(serialized)
+    return engine_path
+
+
+def _build_serialized(builder, network, config, profile, engine_path: str,
+                      calibration_dir: Optional[str]):
+    """Set up INT8 calibration if requested and build the engine (CUDA context pushed)"""
+    trt, _ = _import_tensorrt()
+    if calibration_dir is not None:
+        if not builder.platform_has_fast_int8:
+            raise RuntimeError("This GPU has no fast INT8 support")
+        image_paths = sorted(str(p) for p in Path(calibration_dir).iterdir()
+                             if p.suffix.lower() in IMAGE_EXTENSIONS)[:CALIBRATION_MAX_IMAGES]
+        cache_path = f"{engine_path}.calib"
+        if not image_paths and not os.path.exists(cache_path):
+            raise FileNotFoundError(f"No calibration images found in {calibration_dir}")
+        config.set_flag(trt.BuilderFlag.INT8)
+        config.int8_calibrator = _int8_calibrator(image_paths, cache_path)
+        config.set_calibration_profile(profile)
+    
+    return builder.build_serialized_network(network, config)
+
+
+def _create_onnx_session(onnx_path: str):
+    """
+    Create an ONNX Runtime session, on the GPU when a CUDA provider is installed
+    
+    Args:
+        onnx_path: Path to the ONNX model
+        
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    available = ort.get_available_providers()
+    providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+    return ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+
+
+def _yolov8_rows(output: np.ndarray, input_size: int) -> np.ndarray:
+    """
+    Convert YOLOv8 output to the Darknet row layout the decoder expects
+    
+    Args:
+        output: (N, 4 + classes, boxes) array with cx, cy, w, h in input pixels
+            followed by class scores
+        input_size: Model input width/height in pixels
+        
+    Returns:
+        (N, boxes, 5 + classes) array: normalized cx, cy, w, h, objectness
+        (always 1, YOLOv8 has none), class scores
+    """
+    batch, channels, boxes = output.shape
+    transposed = output.transpose(0, 2, 1)
+    rows = np.empty((batch, boxes, channels + 1), dtype=np.float32)
+    rows[..., :4] = transposed[..., :4] / np.float32(input_size)
+    rows[..., 4] = 1.0
+    rows[..., 5:] = transposed[..., 4:]
+    return rows
+
+
+def _cuda_compute_capability(device: int = 0) -> Tuple[int, int]:
+    """
+    Get the compute capability of a CUDA device
+    
+    Args:
+        device: CUDA device index
+        
+    Returns:
+        (major, minor) version, or (0, 0) if it cannot be queried
+    """
+    try:
+        info = cv2.cuda.DeviceInfo(device)
+        return info.majorVersion(), info.minorVersion()
+    except Exception:
+        # Builds without CUDA raise cv2.error (wrapped in SystemError by some bindings)
+        return 0, 0
+
+
+class _TensorRTEngine:
+    """Runs a serialized TensorRT engine with preallocated pinned and device buffers"""
+    
+    def __init__(self, engine_path: str):
+        """
+        Load a serialized engine
+        
+        Args:
+            engine_path: Path to an engine written by build_engine()
+        """
+        trt, cuda = _import_tensorrt()
+        self._cuda = cuda
+        self._cuda_context = _cuda_context()
+        self._cuda_context.push()
+        try:
+            self._load(trt, engine_path)
+        finally:
+            self._cuda_context.pop()
+    
+    def _load(self, trt, engine_path: str):
+        """Deserialize the engine and allocate its buffers (CUDA context pushed)"""
+        cuda = self._cuda
+        
+        # Map the file instead of reading it into a fresh bytes object
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            self.engine = runtime.deserialize_cuda_engine(data)
+        if self.engine is None:
+            raise RuntimeError(f"Failed to load TensorRT engine: {engine_path}")
+        
+        self.context = self.engine.create_execution_context()
+        self.stream = cuda.Stream()
+        
+        self.input_name = None
+        self.output_names = []
+        for i in range(self.engine.num_io_tensors):
+            name = self.engine.get_tensor_name(i)
+            if self.engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT:
+                self.input_name = name
+            else:
+                self.output_names.append(name)
+        
+        # Size every buffer for the largest batch once, so inference never allocates
+        self.context.set_input_shape(self.input_name, (ENGINE_MAX_BATCH, 3, INPUT_SIZE, INPUT_SIZE))
+        self._host = {}
+        self._device = {}
+        for name in [self.input_name] + self.output_names:
+            shape = self.context.get_tensor_shape(name)
+            dtype = trt.nptype(self.engine.get_tensor_dtype(name))
+            self._host[name] = cuda.pagelocked_empty(int(np.prod(shape)), dtype)
+            self._device[name] = cuda.mem_alloc(self._host[name].nbytes)
+            self.context.set_tensor_address(name, int(self._device[name]))
+        
+        # Device-side preprocessing: the three planes of the first input image
+        # are GpuMat headers over the engine's own input buffer
+        self.gpu_preprocess = _gpu_preprocess_available()
+        if self.gpu_preprocess:
+            plane_bytes = INPUT_SIZE * INPUT_SIZE * np.dtype(np.float32).itemsize
+            input_ptr = int(self._device[self.input_name])
+            self._gpu_planes = [
+                cv2.cuda.createGpuMatFromCudaMemory(INPUT_SIZE, INPUT_SIZE, cv2.CV_32FC1,
+                                                    input_ptr + c * plane_bytes)
+                for c in range(3)
+            ]
+            self._resized = np.empty((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8)
+            self._gpu_bgr = cv2.cuda_GpuMat(INPUT_SIZE, INPUT_SIZE, cv2.CV_8UC3)
+            self._gpu_rgb = cv2.cuda_GpuMat(INPUT_SIZE, INPUT_SIZE, cv2.CV_8UC3)
+            self._gpu_float = cv2.cuda_GpuMat(INPUT_SIZE, INPUT_SIZE, cv2.CV_32FC3)
+    
+    def input_buffer(self, batch: int) -> np.ndarray:
+        """
+        Get the pinned host input buffer as an NCHW array
+        
+        Args:
+            batch: Batch size the view should cover
+            
+        Returns:
+            View of shape (batch, 3, 416, 416); infer() skips the staging
+            copy when passed this view
+        """
+        size = batch * 3 * INPUT_SIZE * INPUT_SIZE
+        return self._host[self.input_name][:size].reshape(batch, 3, INPUT_SIZE, INPUT_SIZE)
+    
+    def infer(self, blob: np.ndarray) -> List[np.ndarray]:
+        """
+        Run the engine on an NCHW float32 blob
+        
+        Args:
+            blob: Input of shape (N, 3, 416, 416), N <= ENGINE_MAX_BATCH
+            
+        Returns:
+            One array per engine output, shaped (N, rows, 85)
+        """
+        cuda = self._cuda
+        self._cuda_context.push()
+        try:
+            host_in = self._host[self.input_name][:blob.size]
+            if not np.shares_memory(host_in, blob):
+                np.copyto(host_in, blob.ravel())
+            cuda.memcpy_htod_async(self._device[self.input_name], host_in, self.stream)
+            return self._execute(blob.shape[0])
+        finally:
+            self._cuda_context.pop()
+    
+    def infer_image(self, image: np.ndarray) -> List[np.ndarray]:
+        """
+        Run the engine on one BGR image, preprocessing it on the GPU
+        
+        Only the resized 8-bit frame crosses the bus (a quarter of the float
+        blob); color conversion and scaling write straight into the engine's
+        input buffer. Requires gpu_preprocess.
+        
+        Args:
+            image: BGR input image
+            
+        Returns:
+            One array per engine output, shaped (1, rows, 85)
+        """
+        self._cuda_context.push()
+        try:
+            cv2.resize(image, (INPUT_SIZE, INPUT_SIZE), dst=self._resized)
+            self._gpu_bgr.upload(self._resized)
+            cv2.cuda.cvtColor(self._gpu_bgr, cv2.COLOR_BGR2RGB, dst=self._gpu_rgb)
+            self._gpu_rgb.convertTo(cv2.CV_32FC3, 1 / 255.0, 0.0, dst=self._gpu_float)
+            cv2.cuda.split(self._gpu_float, self._gpu_planes)
+            return self._execute(1)
+        finally:
+            self._cuda_context.pop()
+    
+    def _execute(self, batch: int) -> List[np.ndarray]:
+        """
+        Run the engine on the input already in the device buffer
+        
+        Args:
+            batch: Number of images in the input buffer
+            
+        Returns:
+            One array per engine output, shaped (batch, rows, 85)
+        """
+        cuda = self._cuda
+        self.context.set_input_shape(self.input_name, (batch, 3, INPUT_SIZE, INPUT_SIZE))
+        self.context.execute_async_v3(self.stream.handle)
+        
+        outputs = []
+        for name in self.output_names:
+            shape = tuple(self.context.get_tensor_shape(name))
+            host_out = self._host[name][:int(np.prod(shape))]
+            cuda.memcpy_dtoh_async(host_out, self._device[name], self.stream)
+            outputs.append((host_out, shape))
+        self.stream.synchronize()
+        
+        return [host_out.reshape(batch, -1, shape[-1]) for host_out, shape in outputs]
+
+
+@dataclass(frozen=True, **_SLOTS)
 class DetectedVehicle:
     """Data class to store vehicle detection information"""
     bbox: Tuple[int, int, int, int]  # x, y, width, height
@@ -13,6 +566,47 @@ class DetectedVehicle:
     class_name: str
     center: Tuple[int, int]
 
+@dataclass(frozen=True, eq=False, **_SLOTS)
+class DetectionResult:
+    """Detections of one image as parallel arrays (one row per vehicle)"""
+    bboxes: np.ndarray  # (N, 4) int32: x, y, width, height
+    confidences: np.ndarray  # (N,) float32
+    class_ids: np.ndarray  # (N,) uint8 COCO class ids
+    
+    def __len__(self) -> int:
+        return len(self.class_ids)
+    
+    @property
+    def centers(self) -> np.ndarray:
+        """(N, 2) int32 box centers"""
+        return self.bboxes[:, :2] + self.bboxes[:, 2:] // 2
+    
+    @property
+    def class_names(self) -> List[str]:
+        """Vehicle type of each detection"""
+        return [VehicleDetector.VEHICLE_CLASSES[c] for c in self.class_ids.tolist()]
+    
+    def to_list(self) -> List[DetectedVehicle]:
+        """
+        Convert to DetectedVehicle objects
+        
+        Returns:
+            List of DetectedVehicle objects, in the same order
+        """
+        return [
+            DetectedVehicle(
+                bbox=tuple(bbox),
+                confidence=confidence,
+                class_name=class_name,
+                center=tuple(center)
+            )
+            for bbox, confidence, class_name, center in zip(
+                self.bboxes.tolist(), self.confidences.tolist(),
+                self.class_names, self.centers.tolist()
+            )
+        ]
+
+
 class VehicleDetector:
     """Enhanced vehicle detection system using YOLO"""
     
@@ -28,7 +622,9 @@ class VehicleDetector:
                  config_path: str = "yolov3.cfg",
                  names_path: str = "coco.names",
                  confidence_threshold: float = 0.5,
-                 nms_threshold: float = 0.4):
+                 nms_threshold: float = 0.4,
+                 engine_path: Optional[str] = None,
+                 onnx_path: Optional[str] = None):
         """
         Initialize the vehicle detector
         
@@ -38,38 +634,127 @@ class VehicleDetector:
             names_path: Path to class names file
             confidence_threshold: Minimum confidence for detections
             nms_threshold: Non-maximum suppression threshold
+            engine_path: Serialized TensorRT engine (see build_engine) to run
+                instead of the OpenCV DNN model (optional)
+            onnx_path: YOLOv8 ONNX export (e.g. yolov8n.onnx) to run with ONNX
+                Runtime instead of the OpenCV DNN model (optional)
         """
         self.confidence_threshold = confidence_threshold
         self.nms_threshold = nms_threshold
+        self.net = None
+        self._engine = None
+        self._session = None
+        self._input_size = INPUT_SIZE
+        # Most images per forward pass, or None when the model takes any batch size
+        self._max_batch: Optional[int] = None
+        self._vehicle_class_array = np.array(list(self.VEHICLE_CLASSES))
+        self._vehicle_mask = None
+        if _filter_rows is not None:
+            # Compile (or load the cached build of) the kernel now rather than on the first frame
+            _filter_rows(np.zeros((1, 85), dtype=np.float32), np.float32(1.0),
+                         self._class_mask(80))
         
-        # Validate files exist
-        if not all(os.path.exists(p) for p in [model_path, config_path, names_path]):
+        # Validate files exist; the Darknet model needs all three, so report them together
+        if engine_path is None and onnx_path is None and \
+                not all(os.path.exists(p) for p in [model_path, config_path, names_path]):
             raise FileNotFoundError(
                 "Required model files not found. Please ensure yolov3.weights, "
                 "yolov3.cfg, and coco.names are in the project directory."
             )
         
+        # Load class names
+        if not os.path.exists(names_path):
+            raise FileNotFoundError(f"Class names file not found: {names_path}")
+        with open(names_path, 'r') as f:
+            self.classes = [line.strip() for line in f.readlines()]
+        
+        # Preprocessing buffers reused by every detect_vehicles() call
+        self._resized = np.empty((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._resized)
+        self._blob = np.empty((1, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+        if _preprocess_416 is not None:
+            _preprocess_416(self._resized, self._blob[0])
+        
+        if engine_path is not None:
+            if not os.path.exists(engine_path):
+                raise FileNotFoundError(f"TensorRT engine not found: {engine_path}")
+            try:
+                self._engine = _TensorRTEngine(engine_path)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load TensorRT engine: {e}")
+            # Fill the engine's pinned input buffer directly so the upload needs no staging copy
+            self._blob = self._engine.input_buffer(1)
+            # The engine profile caps the batch size
+            self._max_batch = ENGINE_MAX_BATCH
+            return
+        
+        if onnx_path is not None:
+            if not os.path.exists(onnx_path):
+                raise FileNotFoundError(f"ONNX model not found: {onnx_path}")
+            if ort is None:
+                raise RuntimeError("YOLOv8 ONNX models need the onnxruntime package")
+            try:
+                self._session = _create_onnx_session(onnx_path)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load ONNX model: {e}")
+            model_input = self._session.get_inputs()[0]
+            self._session_input = model_input.name
+            # Static exports carry their size; dynamic ones report a name instead
+            size = model_input.shape[2]
+            self._input_size = size if isinstance(size, int) else YOLOV8_DEFAULT_INPUT_SIZE
+            # Default Ultralytics exports also fix the batch size, usually at 1
+            batch = model_input.shape[0]
+            self._max_batch = batch if isinstance(batch, int) else None
+            return
+        
         # Load YOLO model
         try:
             self.net = cv2.dnn.readNet(model_path, config_path)
             # Use CUDA if available for better performance
             if cv2.cuda.getCudaEnabledDeviceCount() > 0:
                 self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
-                self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+                # Volta (compute capability 7.0) and newer have FP16 tensor cores
+                if _cuda_compute_capability() >= (7, 0):
+                    self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA_FP16)
+                else:
+                    self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
             else:
                 self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
                 self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
         except Exception as e:
             raise RuntimeError(f"Failed to load YOLO model: {e}")
         
-        # Load class names
-        with open(names_path, 'r') as f:
-            self.classes = [line.strip() for line in f.readlines()]
-        
         # Get output layer names
         layer_names = self.net.getLayerNames()
         self.output_layers = [layer_names[i - 1] for i in self.net.getUnconnectedOutLayers()]
     
+    def detect(self, image: np.ndarray) -> DetectionResult:
+        """
+        Detect vehicles in an image, returning the detections as arrays
+        
+        Args:
+            image: Input image as numpy array
+            
+        Returns:
+            DetectionResult for the image
+        """
+        height, width = image.shape[:2]
+        
+        if self._engine is not None and self._engine.gpu_preprocess:
+            # Preprocess on the GPU, directly into the engine input
+            outputs = self._engine.infer_image(image)
+        else:
+            # Prepare image for YOLO
+            if self._input_size == INPUT_SIZE:
+                blob = self._blob_inplace(image)
+            else:
+                blob = cv2.dnn.blobFromImage(
+                    image, 1/255.0, (self._input_size, self._input_size),
+                    swapRB=True, crop=False
+                )
+            outputs = self._forward(blob)
+        return self._decode_detections([output[0] for output in outputs], width, height)
+    
     def detect_vehicles(self, image: np.ndarray) -> List[DetectedVehicle]:
         """
         Detect vehicles in an image
@@ -80,104 +765,234 @@ class VehicleDetector:
         Returns:
             List of DetectedVehicle objects
         """
-        height, width = image.shape[:2]
+        return self.detect(image).to_list()
+    
+    def detect_batch(self, images: List[np.ndarray]) -> List[DetectionResult]:
+        """
+        Detect vehicles in several images with one forward pass per batch
         
-        # Prepare image for YOLO
-        blob = cv2.dnn.blobFromImage(
-            image, 1/255.0, (416, 416), 
+        Args:
+            images: Input images as numpy arrays (sizes may differ)
+            
+        Returns:
+            One DetectionResult per input image, in order
+        """
+        if not images:
+            return []
+        
+        blob = cv2.dnn.blobFromImages(
+            images, 1/255.0, (self._input_size, self._input_size),
             swapRB=True, crop=False
         )
         
-        # Perform detection
+        if self._max_batch is not None and len(images) > self._max_batch:
+            # Run the blob in slices the model accepts and rejoin them per output.
+            # The engine returns views into its reused host buffers, so each
+            # slice's outputs are copied before the next run overwrites them
+            chunks = [[output.copy() for output in self._forward(blob[start:start + self._max_batch])]
+                      for start in range(0, len(images), self._max_batch)]
+            outputs = [np.concatenate(parts) for parts in zip(*chunks)]
+        else:
+            outputs = self._forward(blob)
+        
+        results = []
+        for n, image in enumerate(images):
+            height, width = image.shape[:2]
+            results.append(self._decode_detections([output[n] for output in outputs], width, height))
+        return results
+    
+    def detect_vehicles_batch(self, images: List[np.ndarray]) -> List[List[DetectedVehicle]]:
+        """
+        Detect vehicles in several images with one forward pass per batch
+        
+        Args:
+            images: Input images as numpy arrays (sizes may differ)
+            
+        Returns:
+            One list of DetectedVehicle objects per input image, in order
+        """
+        return [result.to_list() for result in self.detect_batch(images)]
+    
+    def _class_mask(self, num_classes: int) -> np.ndarray:
+        """Boolean array over class ids, True for vehicle classes"""
+        mask = np.zeros(num_classes, dtype=np.bool_)
+        mask[[c for c in self.VEHICLE_CLASSES if c < num_classes]] = True
+        return mask
+    
+    def run(self, images: Iterable[np.ndarray],
+            batch_size: int = DIRECTORY_BATCH_SIZE) -> Iterator[DetectionResult]:
+        """
+        Detect vehicles in a stream of images, batching forward passes
+        
+        Library entry point for bulk processing: no windows, no files.
+        
+        Args:
+            images: Input images (any iterable, consumed lazily)
+            batch_size: Images per forward pass
+            
+        Yields:
+            One DetectionResult per input image, in order
+        """
+        images = iter(images)
+        while True:
+            batch = list(islice(images, batch_size))
+            if not batch:
+                return
+            yield from self.detect_batch(batch)
+    
+    def _blob_inplace(self, image: np.ndarray) -> np.ndarray:
+        """
+        Build the network input for one image in preallocated buffers
+        
+        Produces the same values as cv2.dnn.blobFromImage(image, 1/255.0,
+        (416, 416), swapRB=True, crop=False) without allocating.
+        
+        Args:
+            image: BGR input image
+            
+        Returns:
+            The detector's (1, 3, 416, 416) blob buffer, overwritten
+        """
+        cv2.resize(image, (INPUT_SIZE, INPUT_SIZE), dst=self._resized)
+        if _preprocess_416 is not None:
+            _preprocess_416(self._resized, self._blob[0])
+        else:
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            np.multiply(self._rgb.transpose(2, 0, 1), np.float32(1 / 255.0), out=self._blob[0])
+        return self._blob
+    
+    def _forward(self, blob: np.ndarray) -> List[np.ndarray]:
+        """
+        Run the network on an NCHW blob
+        
+        Args:
+            blob: Preprocessed input of shape (N, 3, size, size)
+            
+        Returns:
+            One array per output layer, shaped (N, rows, 85)
+        """
+        if self._engine is not None:
+            return self._engine.infer(blob)
+        
+        if self._session is not None:
+            output = self._session.run(None, {self._session_input: blob})[0]
+            return [_yolov8_rows(output, self._input_size)]
+        
         self.net.setInput(blob)
         outputs = self.net.forward(self.output_layers)
+        # OpenCV flattens the batch axis into the rows for some layer types
+        batch = blob.shape[0]
+        return [output.reshape(batch, -1, output.shape[-1]) for output in outputs]
+    
+    def _decode_detections(self, outputs: List[np.ndarray], width: int,
+                           height: int) -> DetectionResult:
+        """
+        Turn raw YOLO rows for one image into NMS-filtered vehicle detections
         
-        # Process detections
-        boxes = []
-        confidences = []
-        class_ids = []
-        
-        for output in outputs:
-            for detection in output:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
-                
-                # Filter for vehicles only
-                if confidence > self.confidence_threshold and class_id in self.VEHICLE_CLASSES:
-                    # Get bounding box coordinates
-                    center_x = int(detection[0] * width)
-                    center_y = int(detection[1] * height)
-                    w = int(detection[2] * width)
-                    h = int(detection[3] * height)
-                    
-                    x = int(center_x - w / 2)
-                    y = int(center_y - h / 2)
-                    
-                    boxes.append([x, y, w, h])
-                    confidences.append(float(confidence))
-                    class_ids.append(class_id)
+        Args:
+            outputs: One (rows, 85) array per output layer
+            width: Original image width
+            height: Original image height
+            
+        Returns:
+            DetectionResult for the image
+        """
+        # Process detections for all rows of all output layers at once
+        rows = outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=0)
+        
+        if _filter_rows is not None:
+            # Single compiled pass: argmax, threshold and vehicle test per row
+            num_classes = rows.shape[1] - 5
+            if self._vehicle_mask is None or len(self._vehicle_mask) != num_classes:
+                self._vehicle_mask = self._class_mask(num_classes)
+            keep, class_ids, confidences = _filter_rows(
+                np.ascontiguousarray(rows), rows.dtype.type(self.confidence_threshold),
+                self._vehicle_mask
+            )
+        else:
+            keep, class_ids, confidences = _filter_rows_numpy(
+                rows, self.confidence_threshold, self._vehicle_class_array
+            )
+        rows = rows[keep]
+        
+        # Only the strongest candidates can survive NMS; drop the rest up front
+        if len(confidences) > NMS_CANDIDATES:
+            top = np.argpartition(-confidences, NMS_CANDIDATES)[:NMS_CANDIDATES]
+            rows = rows[top]
+            confidences = confidences[top]
+            class_ids = class_ids[top]
+        
+        # Get bounding box coordinates (truncated like int() on each value)
+        center_x = (rows[:, 0] * width).astype(np.int32)
+        center_y = (rows[:, 1] * height).astype(np.int32)
+        w = (rows[:, 2] * width).astype(np.int32)
+        h = (rows[:, 3] * height).astype(np.int32)
+        x = (center_x - w / 2).astype(np.int32)
+        y = (center_y - h / 2).astype(np.int32)
+        
+        boxes = np.stack([x, y, w, h], axis=1)
         
         # Apply non-maximum suppression to remove duplicate detections
         indices = cv2.dnn.NMSBoxes(
-            boxes, confidences, 
+            boxes.tolist(), confidences.tolist(), 
             self.confidence_threshold, 
-            self.nms_threshold
+            self.nms_threshold,
+            top_k=MAX_DETECTIONS
         )
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
         
-        # Create DetectedVehicle objects
-        vehicles = []
-        if len(indices) > 0:
-            for i in indices.flatten():
-                x, y, w, h = boxes[i]
-                center_x = x + w // 2
-                center_y = y + h // 2
-                
-                vehicle = DetectedVehicle(
-                    bbox=(x, y, w, h),
-                    confidence=confidences[i],
-                    class_name=self.VEHICLE_CLASSES[class_ids[i]],
-                    center=(center_x, center_y)
-                )
-                vehicles.append(vehicle)
-        
-        return vehicles
+        return DetectionResult(
+            bboxes=boxes[indices],
+            confidences=confidences[indices],
+            class_ids=class_ids[indices].astype(np.uint8)
+        )
     
-    def draw_detections(self, image: np.ndarray, vehicles: List[DetectedVehicle]) -> np.ndarray:
+    def draw_detections(self, image: np.ndarray,
+                        vehicles: Union[DetectionResult, List[DetectedVehicle]],
+                        inplace: bool = False) -> np.ndarray:
         """
         Draw bounding boxes and labels on image
         
         Args:
             image: Input image
-            vehicles: List of detected vehicles
+            vehicles: Detected vehicles (DetectionResult or list)
+            inplace: Draw on image itself instead of a copy
             
         Returns:
             Image with drawn detections
         """
-        result = image.copy()
+        result = image if inplace else image.copy()
+        if not len(vehicles):
+            return result
         
-        # Define colors for different vehicle types
-        colors = {
-            'car': (0, 255, 0),      # Green
-            'motorcycle': (255, 0, 0),  # Blue
-            'bus': (0, 0, 255),      # Red
-            'truck': (255, 255, 0)   # Cyan
-        }
+        if isinstance(vehicles, DetectionResult):
+            bboxes = vehicles.bboxes
+            class_names = vehicles.class_names
+            confidences = vehicles.confidences.tolist()
+        else:
+            bboxes = np.array([v.bbox for v in vehicles], dtype=np.int32)
+            class_names = [v.class_name for v in vehicles]
+            confidences = [v.confidence for v in vehicles]
         
-        for vehicle in vehicles:
-            x, y, w, h = vehicle.bbox
-            color = colors.get(vehicle.class_name, (0, 255, 0))
-            
-            # Draw bounding box
-            cv2.rectangle(result, (x, y), (x + w, y + h), color, 2)
+        # Draw all boxes of a class in one call
+        x, y, w, h = bboxes.T
+        corners = np.stack([
+            np.stack([x, y], axis=1),
+            np.stack([x + w, y], axis=1),
+            np.stack([x + w, y + h], axis=1),
+            np.stack([x, y + h], axis=1)
+        ], axis=1)
+        names = np.array(class_names)
+        for class_name in set(class_names):
+            color = DETECTION_COLORS.get(class_name, DEFAULT_DETECTION_COLOR)
+            cv2.polylines(result, corners[names == class_name], True, color, 2)
+        
+        for (x, y, _, _), class_name, confidence in zip(bboxes.tolist(), class_names, confidences):
+            color = DETECTION_COLORS.get(class_name, DEFAULT_DETECTION_COLOR)
             
             # Draw label with confidence
-            label = f"{vehicle.class_name.capitalize()}: {vehicle.confidence:.2f}"
-            
-            # Calculate label size and position
-            (label_w, label_h), baseline = cv2.getTextSize(
-                label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1
-            )
+            label = f"{class_name.capitalize()}: {confidence:.2f}"
+            label_w, label_h = _label_size(label)
             
             # Draw label background
             cv2.rectangle(
@@ -188,35 +1003,170 @@ class VehicleDetector:
             # Draw label text
             cv2.putText(
                 result, label, (x, y - 5),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
+                LABEL_FONT, LABEL_FONT_SCALE, (255, 255, 255), 1
             )
         
         return result
     
-    def get_vehicle_statistics(self, vehicles: List[DetectedVehicle]) -> Dict[str, int]:
+    def get_vehicle_statistics(self, vehicles: Union[DetectionResult, List[DetectedVehicle]]
+                               ) -> Dict[str, int]:
         """
         Get statistics about detected vehicles
         
         Args:
-            vehicles: List of detected vehicles
+            vehicles: Detected vehicles (DetectionResult or list)
             
         Returns:
             Dictionary with vehicle counts by type
         """
         stats = {'total': len(vehicles)}
+        if isinstance(vehicles, DetectionResult):
+            counts = np.bincount(vehicles.class_ids, minlength=max(self.VEHICLE_CLASSES) + 1)
+            for class_id, vehicle_type in self.VEHICLE_CLASSES.items():
+                stats[vehicle_type] = int(counts[class_id])
+            return stats
+        
+        counts = Counter(v.class_name for v in vehicles)
         for vehicle_type in self.VEHICLE_CLASSES.values():
-            count = sum(1 for v in vehicles if v.class_name == vehicle_type)
-            stats[vehicle_type] = count
+            stats[vehicle_type] = counts[vehicle_type]
         return stats
 
 
+# Detector shared by detect_vehicles_from_image calls
+_DETECTOR: Optional[VehicleDetector] = None
+
+
+def _get_detector() -> VehicleDetector:
+    """Get the shared detector, loading the model on first use"""
+    global _DETECTOR
+    if _DETECTOR is None:
+        _DETECTOR = VehicleDetector()
+    return _DETECTOR
+
+
+def _can_display() -> bool:
+    """Check whether an interactive session can show an OpenCV window"""
+    if not sys.stdout.isatty():
+        return False
+    if sys.platform.startswith('linux'):
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+
+def _print_statistics(stats: Dict[str, int]):
+    """Print per-type vehicle counts"""
+    print(f"Total vehicles detected: {stats['total']}")
+    for vehicle_type, count in stats.items():
+        if vehicle_type != 'total' and count > 0:
+            print(f"  {vehicle_type.capitalize()}: {count}")
+
+
+def _detect_directory(detector: VehicleDetector, directory: str, output_dir: str) -> int:
+    """
+    Detect vehicles in every image of a directory, in batches
+    
+    Reading, detection and drawing/writing run as a pipeline: a reader
+    thread decodes the next batch and a writer thread saves the previous
+    one while the current batch is being detected.
+    
+    Args:
+        detector: Initialized detector
+        directory: Directory containing input images
+        output_dir: Directory to write annotated images to
+        
+    Returns:
+        Total number of vehicles detected across all images
+    """
+    paths = sorted(p for p in Path(directory).iterdir()
+                   if p.suffix.lower() in IMAGE_EXTENSIONS)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    # Bounded queues keep at most a few batches in flight
+    read_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+    write_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+    
+    stop_event = threading.Event()
+    
+    def put(q, item):
+        # Give up once the consumer has stopped, so the thread can exit
+        while not stop_event.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def reader():
+        try:
+            for start in range(0, len(paths), DIRECTORY_BATCH_SIZE):
+                if stop_event.is_set():
+                    break
+                batch = []
+                for path in paths[start:start + DIRECTORY_BATCH_SIZE]:
+                    image = cv2.imread(str(path))
+                    if image is None:
+                        print(f"Warning: Failed to load image: {path}")
+                        continue
+                    batch.append((path, image))
+                if batch:
+                    put(read_q, batch)
+        finally:
+            put(read_q, None)
+    
+    def writer():
+        while True:
+            item = write_q.get()
+            if item is None:
+                break
+            path, image, vehicles = item
+            result_path = Path(output_dir) / f"detected_{path.name}"
+            try:
+                result = detector.draw_detections(image, vehicles, inplace=True)
+                if not cv2.imwrite(str(result_path), result):
+                    print(f"Warning: Failed to write image: {result_path}")
+            except Exception as e:
+                print(f"Warning: Failed to write image {result_path}: {e}")
+    
+    workers = [threading.Thread(target=reader, daemon=True),
+               threading.Thread(target=writer, daemon=True)]
+    for worker in workers:
+        worker.start()
+    
+    total = 0
+    try:
+        while True:
+            batch = read_q.get()
+            if batch is None:
+                break
+            
+            images = [image for _, image in batch]
+            for (path, image), vehicles in zip(batch, detector.detect_batch(images)):
+                stats = detector.get_vehicle_statistics(vehicles)
+                print(f"\n{path.name}:")
+                _print_statistics(stats)
+                total += stats['total']
+                write_q.put((path, image, vehicles))
+    finally:
+        write_q.put(None)
+        workers[1].join()
+        stop_event.set()
+        workers[0].join()
+    
+    print(f"\nProcessed {len(paths)} images, {total} vehicles in total")
+    print(f"Results saved to: {output_dir}")
+    return total
+
+
 def detect_vehicles_from_image(image_path: str, output_path: str = None) -> int:
     """
     Detect vehicles in an image and optionally save the result
     
     Args:
-        image_path: Path to input image
-        output_path: Path to save output image (optional)
+        image_path: Path to input image, or to a directory of images
+        output_path: Path to save output image (optional; shown in a window
+            when interactive, saved to detected_vehicles.jpg otherwise); for
+            a directory, the directory to save annotated images to
+            (default: <dir>/detected)
         
     Returns:
         Number of vehicles detected
@@ -225,29 +1175,32 @@ def detect_vehicles_from_image(image_path: str, output_path: str = None) -> int:
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image not found: {image_path}")
     
+    if os.path.isdir(image_path):
+        output_dir = output_path or os.path.join(image_path, "detected")
+        return _detect_directory(_get_detector(), image_path, output_dir)
+    
     # Load image
     image = cv2.imread(image_path)
     if image is None:
         raise ValueError(f"Failed to load image: {image_path}")
     
-    # Initialize detector
-    detector = VehicleDetector()
+    # Initialize detector (loaded once per process)
+    detector = _get_detector()
     
     # Detect vehicles
-    vehicles = detector.detect_vehicles(image)
+    vehicles = detector.detect(image)
     
     # Get statistics
     stats = detector.get_vehicle_statistics(vehicles)
     print(f"\nVehicle Detection Results:")
-    print(f"Total vehicles detected: {stats['total']}")
-    for vehicle_type, count in stats.items():
-        if vehicle_type != 'total' and count > 0:
-            print(f"  {vehicle_type.capitalize()}: {count}")
+    _print_statistics(stats)
     
     # Draw detections
-    result_image = detector.draw_detections(image, vehicles)
+    result_image = detector.draw_detections(image, vehicles, inplace=True)
     
-    # Save or display
+    # Save or display; never block on a window nobody can see
+    if not output_path and not _can_display():
+        output_path = DEFAULT_RESULT_PATH
     if output_path:
         cv2.imwrite(output_path, result_image)
         print(f"\nResult saved to: {output_path}")
@@ -261,8 +1214,6 @@ def detect_vehicles_from_image(image_path: str, output_path: str = None) -> int:
 
 
 if __name__ == "__main__":
-    import sys
-    
     # Get image path from command line or prompt user
     if len(sys.argv) > 1:
         image_path = sys.argv[1]
@@ -270,7 +1221,8 @@ if __name__ == "__main__":
         image_path = input("Enter the path to the image: ").strip()
     
     try:
-        vehicle_count = detect_vehicles_from_image(image_path, "detected_vehicles.jpg")
+        output_path = None if os.path.isdir(image_path) else DEFAULT_RESULT_PATH
+        vehicle_count = detect_vehicles_from_image(image_path, output_path)
         
         # Save count to file for traffic signal adjustment
         with open("vehicle_count.txt", "w") as f:
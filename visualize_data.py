@@ -5,45 +5,140 @@ Generates charts and reports from historical data
 """
 
 import json
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Union
 import sys
 
+import numpy as np
 
-def load_cycle_data(filepath: str = "traffic_data/cycle_data.json") -> List[Dict]:
-    """Load cycle data from JSON file"""
+try:
+    import orjson
+except ImportError:  # Optional: Rust-backed JSON parser
+    orjson = None
+
+FIXED_GREEN_TIME = 30  # Fixed-timing baseline in seconds
+
+# Columns extracted from each cycle record for the reports
+CYCLE_FIELDS = [('vehicle_count', 'i8'), ('green_time', 'i8'), ('algorithm', 'U32')]
+
+# Green time histogram: inclusive upper bounds of all but the last bin, which
+# (like the first) also catches anything outside 15-120s
+GREEN_TIME_BIN_BOUNDS = np.array([30, 45, 60, 90])
+GREEN_TIME_BIN_LABELS = ["15-30s", "31-45s", "46-60s", "61-90s", "91-120s"]
+
+
+def _json_loads(data: bytes):
+    """Parse JSON from bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_cycle_data(filepath: Union[str, Path] = "traffic_data/cycle_data.jsonl") -> List[Dict]:
+    """Load cycle data from a JSON Lines file (or a legacy JSON array file)"""
+    path = Path(filepath)
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        raw = path.read_bytes()
+        if path.suffix != '.jsonl':
+            return _json_loads(raw)
+        
+        records = []
+        for line_no, line in enumerate(raw.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(_json_loads(line))
+            except ValueError:
+                # A crash mid-append can leave a truncated last line
+                print(f"Warning: Skipping malformed cycle record on line {line_no}")
+        return records
     except FileNotFoundError:
         print(f"Error: Data file not found: {filepath}")
         return []
-    except json.JSONDecodeError:
+    except ValueError:
         print(f"Error: Invalid JSON in {filepath}")
         return []
 
 
-def print_summary(data: List[Dict]):
+@dataclass
+class VisualizationCtx:
+    """Cycle data gathered in one pass, shared by all report printers"""
+    n: int
+    records: np.ndarray  # Structured array with CYCLE_FIELDS columns
+    cycles: List[Dict]  # The raw records, for keys that are not columns
+    vehicle_breakdown: Counter
+    first_timestamp: str
+    last_timestamp: str
+    
+    @property
+    def vehicle_counts(self) -> np.ndarray:
+        return self.records['vehicle_count']
+    
+    @property
+    def green_times(self) -> np.ndarray:
+        return self.records['green_time']
+    
+    @property
+    def algorithms(self) -> np.ndarray:
+        return self.records['algorithm']
+
+
+def build_context(data: List[Dict]) -> VisualizationCtx:
+    """
+    Extract everything the reports need from the cycle records
+    
+    Args:
+        data: Cycle records
+        
+    Returns:
+        VisualizationCtx for the records
+    """
+    vehicle_breakdown = Counter()
+    
+    def rows():
+        for cycle in data:
+            vehicle_breakdown.update(cycle.get('vehicle_stats', {}))
+            yield cycle['vehicle_count'], cycle['green_time'], cycle.get('algorithm', 'unknown')
+    
+    # Stream the columns straight into one structured array, no intermediate lists
+    records = np.fromiter(rows(), dtype=CYCLE_FIELDS, count=len(data))
+    vehicle_breakdown.pop('total', None)
+    
+    return VisualizationCtx(
+        n=len(data),
+        records=records,
+        cycles=data,
+        vehicle_breakdown=vehicle_breakdown,
+        first_timestamp=data[0]['timestamp'] if data else '',
+        last_timestamp=data[-1]['timestamp'] if data else ''
+    )
+
+
+def _as_context(data: Union[VisualizationCtx, List[Dict]]) -> VisualizationCtx:
+    """Accept either raw cycle records or a prebuilt context"""
+    return data if isinstance(data, VisualizationCtx) else build_context(data)
+
+
+def print_summary(data: Union[VisualizationCtx, List[Dict]]):
     """Print summary statistics"""
-    if not data:
+    ctx = _as_context(data)
+    if not ctx.n:
         print("No data available")
         return
     
-    total_cycles = len(data)
-    total_vehicles = sum(c['vehicle_count'] for c in data)
-    avg_vehicles = total_vehicles / total_cycles
+    green_times = ctx.green_times
     
-    avg_green = sum(c['green_time'] for c in data) / total_cycles
-    min_green = min(c['green_time'] for c in data)
-    max_green = max(c['green_time'] for c in data)
+    total_cycles = ctx.n
+    total_vehicles = int(ctx.vehicle_counts.sum())
+    avg_vehicles = total_vehicles / total_cycles
     
-    # Vehicle types
-    vehicle_breakdown = {}
-    for cycle in data:
-        for v_type, count in cycle.get('vehicle_stats', {}).items():
-            if v_type != 'total':
-                vehicle_breakdown[v_type] = vehicle_breakdown.get(v_type, 0) + count
+    avg_green = green_times.mean()
+    min_green = int(green_times.min())
+    max_green = int(green_times.max())
+    time_saved = int((green_times - FIXED_GREEN_TIME).clip(min=0).sum())
     
     print("\n" + "="*60)
     print("TRAFFIC MANAGEMENT SYSTEM - DATA SUMMARY")
@@ -51,13 +146,13 @@ def print_summary(data: List[Dict]):
     
     print(f"\n📊 CYCLE STATISTICS")
     print(f"   Total Cycles: {total_cycles}")
-    print(f"   Date Range: {data[0]['timestamp'][:10]} to {data[-1]['timestamp'][:10]}")
+    print(f"   Date Range: {ctx.first_timestamp[:10]} to {ctx.last_timestamp[:10]}")
     
     print(f"\n🚗 VEHICLE STATISTICS")
     print(f"   Total Vehicles Detected: {total_vehicles}")
     print(f"   Average per Cycle: {avg_vehicles:.1f}")
     print(f"   Vehicle Breakdown:")
-    for v_type, count in sorted(vehicle_breakdown.items()):
+    for v_type, count in sorted(ctx.vehicle_breakdown.items()):
         percentage = (count / total_vehicles * 100) if total_vehicles > 0 else 0
         print(f"      - {v_type.capitalize()}: {count} ({percentage:.1f}%)")
     
@@ -65,20 +160,22 @@ def print_summary(data: List[Dict]):
     print(f"   Average Green Time: {avg_green:.1f} seconds")
     print(f"   Minimum Green Time: {min_green} seconds")
     print(f"   Maximum Green Time: {max_green} seconds")
-    print(f"   Time Saved vs Fixed (30s): {sum(c['green_time'] - 30 for c in data if c['green_time'] > 30):.0f} seconds total")
+    print(f"   Time Saved vs Fixed (30s): {time_saved:.0f} seconds total")
     
     print("\n" + "="*60 + "\n")
 
 
-def print_ascii_chart(data: List[Dict], metric: str = "vehicle_count"):
+def print_ascii_chart(data: Union[VisualizationCtx, List[Dict]], metric: str = "vehicle_count"):
     """Print ASCII bar chart"""
-    if not data:
+    ctx = _as_context(data)
+    if not ctx.n:
         return
     
     # Take last 20 data points
-    recent_data = data[-20:]
-    
-    values = [d[metric] for d in recent_data]
+    if metric in ctx.records.dtype.names:
+        values = ctx.records[metric][-20:].tolist()
+    else:
+        values = [cycle[metric] for cycle in ctx.cycles[-20:]]
     max_value = max(values) if values else 1
     
     chart_width = 50
@@ -95,33 +192,30 @@ def print_ascii_chart(data: List[Dict], metric: str = "vehicle_count"):
     print(f"Max: {max_value}  Avg: {sum(values)/len(values):.1f}\n")
 
 
-def print_time_distribution(data: List[Dict]):
+def green_time_histogram(green_times: np.ndarray) -> Dict[str, int]:
+    """
+    Count green times per GREEN_TIME_BIN_LABELS bin
+    
+    Args:
+        green_times: Green times in seconds
+        
+    Returns:
+        Dictionary of bin label to count, in bin order
+    """
+    # Each time's bin is the number of bounds below it
+    bin_idx = np.searchsorted(GREEN_TIME_BIN_BOUNDS, green_times, side='left')
+    counts = np.bincount(bin_idx, minlength=len(GREEN_TIME_BIN_LABELS))
+    return dict(zip(GREEN_TIME_BIN_LABELS, counts.tolist()))
+
+
+def print_time_distribution(data: Union[VisualizationCtx, List[Dict]]):
     """Print distribution of green light times"""
-    if not data:
+    ctx = _as_context(data)
+    if not ctx.n:
         return
     
-    green_times = [d['green_time'] for d in data]
-    
-    # Create histogram bins
-    bins = {
-        "15-30s": 0,
-        "31-45s": 0,
-        "46-60s": 0,
-        "61-90s": 0,
-        "91-120s": 0
-    }
-    
-    for time in green_times:
-        if time <= 30:
-            bins["15-30s"] += 1
-        elif time <= 45:
-            bins["31-45s"] += 1
-        elif time <= 60:
-            bins["46-60s"] += 1
-        elif time <= 90:
-            bins["61-90s"] += 1
-        else:
-            bins["91-120s"] += 1
+    green_times = ctx.green_times
+    bins = green_time_histogram(green_times)
     
     total = len(green_times)
     max_count = max(bins.values())
@@ -138,22 +232,24 @@ def print_time_distribution(data: List[Dict]):
     print("-" * 60 + "\n")
 
 
-def print_efficiency_analysis(data: List[Dict]):
+def print_efficiency_analysis(data: Union[VisualizationCtx, List[Dict]]):
     """Analyze efficiency improvements"""
-    if not data:
+    ctx = _as_context(data)
+    if not ctx.n:
         return
     
-    fixed_baseline = 30  # Assume 30s fixed green time
+    fixed_baseline = FIXED_GREEN_TIME  # Assume 30s fixed green time
+    vehicle_counts = ctx.vehicle_counts
     
-    total_adaptive_time = sum(d['green_time'] for d in data)
-    total_fixed_time = len(data) * fixed_baseline
+    total_adaptive_time = int(ctx.green_times.sum())
+    total_fixed_time = ctx.n * fixed_baseline
     
     time_diff = total_adaptive_time - total_fixed_time
     efficiency = (abs(time_diff) / total_fixed_time * 100)
     
     # Calculate better utilization
-    low_traffic = sum(1 for d in data if d['vehicle_count'] < 5)
-    high_traffic = sum(1 for d in data if d['vehicle_count'] > 15)
+    low_traffic = int((vehicle_counts < 5).sum())
+    high_traffic = int((vehicle_counts > 15).sum())
     
     print("\n⚡ EFFICIENCY ANALYSIS")
     print("-" * 60)
@@ -171,54 +267,53 @@ def print_efficiency_analysis(data: List[Dict]):
         print(f"   Reason: Reduced wait during low-traffic periods")
     
     print(f"\nTraffic Patterns:")
-    print(f"   Low traffic cycles (<5 vehicles): {low_traffic} ({low_traffic/len(data)*100:.1f}%)")
-    print(f"   High traffic cycles (>15 vehicles): {high_traffic} ({high_traffic/len(data)*100:.1f}%)")
+    print(f"   Low traffic cycles (<5 vehicles): {low_traffic} ({low_traffic/ctx.n*100:.1f}%)")
+    print(f"   High traffic cycles (>15 vehicles): {high_traffic} ({high_traffic/ctx.n*100:.1f}%)")
     
     print("\n" + "="*60 + "\n")
 
 
-def print_algorithm_comparison(data: List[Dict]):
+def print_algorithm_comparison(data: Union[VisualizationCtx, List[Dict]]):
     """Compare performance across algorithms"""
-    if not data:
+    ctx = _as_context(data)
+    if not ctx.n:
         return
     
-    by_algorithm = {}
-    for cycle in data:
-        alg = cycle.get('algorithm', 'unknown')
-        if alg not in by_algorithm:
-            by_algorithm[alg] = []
-        by_algorithm[alg].append(cycle)
-    
-    if len(by_algorithm) <= 1:
+    # Algorithms in order of first use
+    algorithms = list(dict.fromkeys(ctx.algorithms.tolist()))
+    if len(algorithms) <= 1:
         return  # Only one algorithm used
     
     print("\n🔬 ALGORITHM COMPARISON")
     print("-" * 60)
     
-    for alg, cycles in by_algorithm.items():
-        avg_green = sum(c['green_time'] for c in cycles) / len(cycles)
-        avg_vehicles = sum(c['vehicle_count'] for c in cycles) / len(cycles)
+    for alg in algorithms:
+        mask = ctx.algorithms == alg
+        cycles = int(mask.sum())
+        avg_green = int(ctx.green_times[mask].sum()) / cycles
+        avg_vehicles = int(ctx.vehicle_counts[mask].sum()) / cycles
         
         print(f"\n{alg.upper()}")
-        print(f"   Cycles: {len(cycles)}")
+        print(f"   Cycles: {cycles}")
         print(f"   Avg Green Time: {avg_green:.1f}s")
         print(f"   Avg Vehicles: {avg_vehicles:.1f}")
     
     print("\n" + "-"*60 + "\n")
 
 
-def export_report(data: List[Dict], output_file: str = "traffic_report.txt"):
+def export_report(data: Union[VisualizationCtx, List[Dict]], output_file: str = "traffic_report.txt"):
     """Export text report"""
+    ctx = _as_context(data)
     with open(output_file, 'w') as f:
         # Redirect stdout to file
         old_stdout = sys.stdout
         sys.stdout = f
         
-        print_summary(data)
-        print_time_distribution(data)
-        print_efficiency_analysis(data)
-        print_ascii_chart(data, "vehicle_count")
-        print_ascii_chart(data, "green_time")
+        print_summary(ctx)
+        print_time_distribution(ctx)
+        print_efficiency_analysis(ctx)
+        print_ascii_chart(ctx, "vehicle_count")
+        print_ascii_chart(ctx, "green_time")
         
         sys.stdout = old_stdout
     
@@ -231,8 +326,8 @@ def main():
     
     parser = argparse.ArgumentParser(description="Visualize traffic system data")
     parser.add_argument(
-        '--file', default='traffic_data/cycle_data.json',
-        help='Path to cycle data JSON file'
+        '--file', default='traffic_data/cycle_data.jsonl',
+        help='Path to cycle data JSON Lines file'
     )
     parser.add_argument(
         '--export', action='store_true',
@@ -253,29 +348,32 @@ def main():
         print("No data to visualize. Run the system first to collect data.")
         return
     
+    # Extract everything once; the reports below only read the context
+    ctx = build_context(data)
+    
     # Print summary
-    print_summary(data)
+    print_summary(ctx)
     
     # Print time distribution
-    print_time_distribution(data)
+    print_time_distribution(ctx)
     
     # Print efficiency analysis
-    print_efficiency_analysis(data)
+    print_efficiency_analysis(ctx)
     
     # Print algorithm comparison
-    print_algorithm_comparison(data)
+    print_algorithm_comparison(ctx)
     
     # Print charts
     if args.chart in ['vehicles', 'both']:
-        print_ascii_chart(data, "vehicle_count")
+        print_ascii_chart(ctx, "vehicle_count")
     
     if args.chart in ['time', 'both']:
-        print_ascii_chart(data, "green_time")
+        print_ascii_chart(ctx, "green_time")
     
     # Export if requested
     if args.export:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        export_report(data, f"traffic_report_{timestamp}.txt")
+        export_report(ctx, f"traffic_report_{timestamp}.txt")
 
 
 if __name__ == "__main__":